@@ -0,0 +1,121 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+from flask import request, send_from_directory
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip variants are always built
+    brotli = None
+
+BUILD_DIR = 'build'
+MANIFEST = 'manifest.json'
+SKIP_DIRS = {BUILD_DIR, 'uploads'}  # Uploads are already content-addressed
+COMPRESSIBLE = {'.css', '.js', '.svg', '.html', '.txt', '.json', '.map', '.ico'}
+IMMUTABLE = 'public, max-age=31536000, immutable'
+# Hash-named uploads and their variants never change either
+CONTENT_ADDRESSED = re.compile(r'^uploads/(variants/)?[0-9a-f]{32}[._]')
+
+
+def _fingerprint(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def build_assets(static_folder):
+    """Copy static files to build/ under content-hashed names, with gzip/brotli siblings.
+
+    Writes build/manifest.json mapping each original path to its fingerprinted
+    one. References inside CSS (url(...)) are not rewritten.
+    """
+    build_root = os.path.join(static_folder, BUILD_DIR)
+    shutil.rmtree(build_root, ignore_errors=True)
+    manifest = {}
+    for root, dirs, files in os.walk(static_folder):
+        rel_root = os.path.relpath(root, static_folder)
+        if rel_root == '.':
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for name in files:
+            source = os.path.join(root, name)
+            rel = os.path.normpath(os.path.join(rel_root, name)).replace(os.sep, '/')
+            stem, ext = os.path.splitext(rel)
+            hashed = f"{BUILD_DIR}/{stem}.{_fingerprint(source)}{ext}"
+            target = os.path.join(static_folder, hashed)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(source, target)
+
+            if ext.lower() in COMPRESSIBLE:
+                with open(source, 'rb') as f:
+                    data = f.read()
+                with open(target + '.gz', 'wb') as f:
+                    f.write(gzip.compress(data, 9, mtime=0))
+                if brotli is not None:
+                    with open(target + '.br', 'wb') as f:
+                        f.write(brotli.compress(data, quality=11))
+            manifest[rel] = hashed
+
+    with open(os.path.join(build_root, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+class Assets:
+    """Serves fingerprinted, precompressed static files built by build_assets.py.
+
+    When build/manifest.json exists, url_for('static', filename=...) is
+    rewritten to the fingerprinted name and those files are sent with an
+    immutable Cache-Control. Requests that accept br/gzip get the precompressed
+    sibling. Without a manifest everything behaves as plain Flask static files.
+    """
+
+    def __init__(self, app=None):
+        self.manifest = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('ASSETS_FINGERPRINT', True)
+        self.static_folder = app.static_folder
+        self.manifest = {}
+        path = os.path.join(app.static_folder, BUILD_DIR, MANIFEST)
+        if app.config['ASSETS_FINGERPRINT'] and os.path.exists(path):
+            with open(path) as f:
+                self.manifest = json.load(f)
+
+        app.url_defaults(self._rewrite_static_url)
+        app.view_functions['static'] = self.send_static
+        app.extensions['assets'] = self
+
+    def _rewrite_static_url(self, endpoint, values):
+        if endpoint == 'static' and 'filename' in values:
+            values['filename'] = self.manifest.get(values['filename'], values['filename'])
+
+    def send_static(self, filename):
+        immutable = filename.startswith(BUILD_DIR + '/') or CONTENT_ADDRESSED.match(filename)
+        served, encoding = filename, None
+        if immutable:
+            accepted = request.accept_encodings
+            for enc, suffix in (('br', '.br'), ('gzip', '.gz')):
+                if accepted[enc] and os.path.isfile(os.path.join(self.static_folder, filename + suffix)):
+                    served, encoding = filename + suffix, enc
+                    break
+
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        response = send_from_directory(self.static_folder, served, mimetype=mimetype,
+                                       max_age=31536000 if immutable else None)
+        if immutable:
+            response.headers['Cache-Control'] = IMMUTABLE
+            response.vary.add('Accept-Encoding')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        return response
+
+
+assets = Assets()
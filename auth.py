@@ -0,0 +1,177 @@
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from flask import current_app, has_app_context, request
+from werkzeug.security import generate_password_hash, check_password_hash
+
+DEFAULT_METHOD = 'scrypt'
+
+
+class LoginThrottled(Exception):
+    """Too many recent attempts from this IP or against this username."""
+
+
+class AuthBusy(Exception):
+    """The password hashing pool is saturated; the client should retry shortly."""
+
+
+# ================
+# Hashing policy
+# ================
+
+_method_prefixes = {}
+
+
+def hash_method(role):
+    """The werkzeug hash method configured for a role, e.g. 'scrypt:32768:8:1' or 'pbkdf2:sha256:600000'."""
+    if not has_app_context():
+        return DEFAULT_METHOD
+    return current_app.config['PASSWORD_HASH_METHODS'].get(role) or DEFAULT_METHOD
+
+
+def hash_password(role, password):
+    return generate_password_hash(password, method=hash_method(role))
+
+
+def _method_prefix(method):
+    # Normalise a method string to what werkzeug stores in the hash ('scrypt' -> 'scrypt:32768:8:1').
+    # Once per method and process, in the pool like any other hash
+    if method not in _method_prefixes:
+        _method_prefixes[method] = hash_pool.generate('', method).split('$', 1)[0]
+    return _method_prefixes[method]
+
+
+def needs_rehash(role, password_hash):
+    return password_hash.split('$', 1)[0] != _method_prefix(hash_method(role))
+
+
+# ================
+# Verification pool
+# ================
+
+class HashPool:
+    """Bounded process pool for the password hashing done at login.
+
+    Verification and rehashing run in AUTH_HASH_WORKERS processes, so login
+    bursts can use at most that many cores per app process and never hold
+    the GIL of the web worker. At most AUTH_HASH_QUEUE jobs wait at once;
+    beyond that AuthBusy is raised instead of queueing unbounded work.
+    AUTH_HASH_WORKERS=0 hashes inline.
+    """
+
+    def __init__(self):
+        self._pool = None
+        self._slots = None
+        self._lock = threading.Lock()
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def generate(self, password, method):
+        return self._run(generate_password_hash, password, method)
+
+    def _run(self, fn, *args):
+        if not has_app_context():
+            return fn(*args)
+        config = current_app.config
+        workers = config['AUTH_HASH_WORKERS']
+        if not workers:
+            return fn(*args)
+
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=workers)
+                self._slots = threading.BoundedSemaphore(config['AUTH_HASH_QUEUE'])
+        if not self._slots.acquire(timeout=config['AUTH_HASH_TIMEOUT']):
+            raise AuthBusy()
+        try:
+            return self._pool.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+
+hash_pool = HashPool()
+
+
+# ================
+# Throttling
+# ================
+
+class Throttle:
+    """Fixed-window counters per key, kept in process memory."""
+
+    def __init__(self):
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key, limit, window):
+        """Count one attempt for `key`; return False once `limit` is exceeded within `window` seconds."""
+        now = time.monotonic()
+        with self._lock:
+            start, count = self._windows.get(key, (now, 0))
+            if now - start >= window:
+                start, count = now, 0
+            count += 1
+            self._windows[key] = (start, count)
+            if len(self._windows) > 100_000:
+                self._prune(now, window)
+        return count <= limit
+
+    def exceeded(self, key, limit, window):
+        start, count = self._windows.get(key, (0, 0))
+        return time.monotonic() - start < window and count >= limit
+
+    def reset(self, key):
+        with self._lock:
+            self._windows.pop(key, None)
+
+    def _prune(self, now, window):
+        for key in [k for k, (start, _) in self._windows.items() if now - start >= window]:
+            del self._windows[key]
+
+
+throttle = Throttle()
+
+
+def authenticate(model, username, password):
+    """Return the matching user, or None for bad credentials.
+
+    Throttling is checked before any hashing so that floods are rejected
+    cheaply: every attempt counts against the client IP (see
+    TRUSTED_PROXY_COUNT when running behind a router), and failures count
+    against the username. Hashes made under an old policy are upgraded on a
+    successful login. Raises LoginThrottled or AuthBusy.
+    """
+    config = current_app.config
+    role = model.ROLE
+    user_key = f"login-user:{role}:{username.lower()}"
+    if not throttle.hit(f"login-ip:{request.remote_addr}", config['LOGIN_IP_LIMIT'], config['LOGIN_IP_WINDOW']):
+        raise LoginThrottled()
+    if throttle.exceeded(user_key, config['LOGIN_USER_LIMIT'], config['LOGIN_USER_WINDOW']):
+        raise LoginThrottled()
+
+    user = model.query.filter_by(username=username).first()
+    if not user or not hash_pool.verify(user.password_hash, password):
+        throttle.hit(user_key, config['LOGIN_USER_LIMIT'], config['LOGIN_USER_WINDOW'])
+        return None
+
+    throttle.reset(user_key)
+    try:
+        if needs_rehash(role, user.password_hash):
+            user.password_hash = hash_pool.generate(password, hash_method(role))
+            model.query.session.commit()
+    except AuthBusy:
+        pass  # The login stands; the hash is upgraded on a later one
+    return user
+
+
+def init_auth(app):
+    app.config.setdefault('PASSWORD_HASH_METHODS', {})
+    app.config.setdefault('AUTH_HASH_WORKERS', 2)
+    app.config.setdefault('AUTH_HASH_QUEUE', 32)
+    app.config.setdefault('AUTH_HASH_TIMEOUT', 5)
+    # Generous per-IP limit: a whole campus can sit behind one NAT address
+    app.config.setdefault('LOGIN_IP_LIMIT', 300)
+    app.config.setdefault('LOGIN_IP_WINDOW', 60)
+    app.config.setdefault('LOGIN_USER_LIMIT', 5)
+    app.config.setdefault('LOGIN_USER_WINDOW', 300)
@@ -0,0 +1,246 @@
+"""Benchmark the key routes in-process or over HTTP, and compare against a saved baseline.
+
+Run generate_data.py first so the pages have production-sized data behind
+them; requests log in as "admin", a generated coordinator and generated
+students (password "password").
+
+Usage:
+    python bench_routes.py --requests 200                                 # Flask test client
+    python bench_routes.py --gunicorn --workers 4 --concurrency 16        # starts a local gunicorn
+    python bench_routes.py --url http://127.0.0.1:8000 --concurrency 16   # an already running server
+    python bench_routes.py --save bench_baseline.json
+    python bench_routes.py --compare bench_baseline.json --tolerance 0.2
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from app import create_app
+from models import db, Event, Registration, Student
+
+PASSWORD = "password"
+
+# name -> (role, method, path builder, expected statuses)
+ROUTES = {
+    "index": (None, "GET", lambda rng, data: "/", {200}),
+    "detail": (None, "GET", lambda rng, data: f"/event/{rng.choice(data['events'])}", {200}),
+    "register_event": ("student", "POST",
+                       lambda rng, data: f"/student/register_event/{rng.choice(data['events'])}", {302}),
+    "admin_reports": ("admin", "GET", lambda rng, data: "/admin/reports", {200}),
+    "admin_view_registrations": ("admin", "GET", lambda rng, data: "/admin/registrations", {200}),
+    "admin_export_registrations": ("admin", "GET",
+                                   lambda rng, data: f"/admin/registrations/export?event_id={rng.choice(data['events'])}",
+                                   {200}),
+    "coordinator_export_participants": ("coordinator", "GET",
+                                        lambda rng, data: f"/coordinator/event/{data['coordinator_event']}/export",
+                                        {200}),
+}
+
+
+def bench_data(app):
+    """Ids the route builders pick from."""
+    with app.app_context():
+        events = [e for e, in db.session.query(Event.id).filter(Event.status == 'Approved').limit(1000)]
+        coordinated = (db.session.query(Event.id, Event.coordinator_id)
+                       .filter(Event.coordinator_id.isnot(None))
+                       .join(Registration, Registration.event_id == Event.id)
+                       .first())
+        students = [u for u, in db.session.query(Student.username)
+                    .filter(Student.username.like('student%')).limit(200)]
+    if not events or not coordinated or not students:
+        sys.exit("No generated data found; run generate_data.py first.")
+    return {"events": events, "coordinator_event": coordinated[0],
+            "coordinator": f"coordinator{coordinated[1]}", "students": students}
+
+
+def percentile(samples, pct):
+    return samples[min(len(samples) - 1, int(round(pct / 100 * len(samples) + 0.5)) - 1)]
+
+
+def summarize(latencies, errors, elapsed):
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "rps": round(len(latencies) / elapsed, 1),
+    }
+
+
+# ================
+# Clients
+# ================
+
+class TestClientSession:
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, data=None):
+        response = self.client.open(path, method=method, data=data)
+        response.get_data()  # Drain streamed bodies so they are part of the timing
+        return response.status_code
+
+
+class HTTPSession:
+    def __init__(self, base_url):
+        self.base_url = base_url
+        jar = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar), NoRedirect())
+
+    def request(self, method, path, data=None):
+        body = urllib.parse.urlencode(data).encode() if data is not None else (b"" if method == "POST" else None)
+        try:
+            with self.opener.open(urllib.request.Request(self.base_url + path, data=body, method=method)) as r:
+                r.read()
+                return r.status
+        except urllib.error.HTTPError as e:
+            e.read()
+            return e.code
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+def login(session, role, data, rng):
+    if role == "admin":
+        session.request("POST", "/admin/login", {"username": "admin", "password": PASSWORD})
+    elif role == "coordinator":
+        session.request("POST", "/coordinator/login", {"username": data["coordinator"], "password": PASSWORD})
+    elif role == "student":
+        session.request("POST", "/student/login", {"username": rng.choice(data["students"]), "password": PASSWORD})
+    return session
+
+
+# ================
+# Runner
+# ================
+
+def run_route(name, make_session, data, requests, concurrency):
+    role, method, build_path, expected = ROUTES[name]
+    rng = random.Random(name)
+    # One logged-in session per concurrent client
+    sessions = [login(make_session(), role, data, rng) for _ in range(concurrency)]
+    paths = [build_path(rng, data) for _ in range(requests)]
+    latencies, errors = [], 0
+    lock = threading.Lock()
+
+    def worker(i):
+        nonlocal errors
+        session = sessions[i]
+        for path in paths[i::concurrency]:
+            start = time.perf_counter()
+            status = session.request(method, path)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                errors += status not in expected
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_gunicorn(workers):
+    port = free_port()
+    process = subprocess.Popen([sys.executable, "-m", "gunicorn", "-w", str(workers), "-b", f"127.0.0.1:{port}",
+                                "--log-level", "warning", "wsgi:app"],
+                               cwd=os.path.dirname(os.path.abspath(__file__)))
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(url + "/", timeout=1).read()
+            return process, url
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    sys.exit("gunicorn did not start")
+
+
+def compare(results, baseline, tolerance):
+    """Print per-route deltas against a baseline; returns True if any p95 or throughput regressed."""
+    regressed = False
+    print(f"\n{'route':<34}{'p95 base':>10}{'p95 now':>10}{'change':>9}{'rps base':>10}{'rps now':>9}")
+    for name, now in results.items():
+        base = baseline.get("routes", {}).get(name)
+        if not base:
+            print(f"{name:<34}{'(new)':>10}")
+            continue
+        p95_change = (now["p95_ms"] - base["p95_ms"]) / base["p95_ms"] if base["p95_ms"] else 0.0
+        slower = p95_change > tolerance or now["rps"] < base["rps"] * (1 - tolerance)
+        regressed |= slower
+        print(f"{name:<34}{base['p95_ms']:>10.1f}{now['p95_ms']:>10.1f}{p95_change:>+9.0%}"
+              f"{base['rps']:>10.1f}{now['rps']:>9.1f}{'  REGRESSED' if slower else ''}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="per route")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--routes", nargs="*", default=list(ROUTES), choices=list(ROUTES))
+    parser.add_argument("--url", help="benchmark a running server over HTTP")
+    parser.add_argument("--gunicorn", action="store_true", help="start a local gunicorn and benchmark over HTTP")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file written by --save")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95/throughput regression")
+    args = parser.parse_args()
+
+    app = create_app()
+    data = bench_data(app)
+    server = None
+    if args.gunicorn:
+        server, args.url = start_gunicorn(args.workers)
+    try:
+        if args.url:
+            mode, make_session = f"http ({args.concurrency} clients)", lambda: HTTPSession(args.url)
+        else:
+            mode, make_session = "test client", lambda: TestClientSession(app)
+
+        print(f"Benchmarking {len(args.routes)} route(s), {args.requests} requests each, {mode}")
+        print(f"{'route':<34}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}{'errors':>8}")
+        results = {}
+        for name in args.routes:
+            results[name] = r = run_route(name, make_session, data, args.requests, args.concurrency)
+            print(f"{name:<34}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['rps']:>9.1f}{r['errors']:>8}")
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"mode": mode, "requests": args.requests, "routes": results}, f, indent=2)
+        print(f"Saved results to {args.save}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("mode") != mode:
+            print(f"Note: baseline was recorded with {baseline.get('mode')}")
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark full-text event search against a LIKE scan over synthetic events.
+
+Usage:
+    python bench_search.py --events 100000 --queries 200
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+WORDS = ("robotics hackathon music festival football cricket seminar workshop quantum physics poetry "
+         "debate chess drama dance photography startup finance marketing chemistry biology yoga "
+         "marathon coding design painting film literature history economics astronomy").split()
+# Pseudo-words so most queries are selective, as real titles and names are
+RARE_WORDS = [a + b + c for a in ("ka", "lo", "mi", "ne", "su", "ta", "vo", "ze", "ri", "pa")
+              for b in ("bra", "cle", "dro", "fin", "gor", "hal", "jun", "kes", "lum", "mor")
+              for c in ("ax", "en", "ix", "on", "ul", "ys", "ar", "et", "id", "ow")]
+VENUES = ["Main Hall", "Auditorium", "Lab Block", "Sports Ground", "Library", "Open Air Theatre"]
+
+
+def generate(events):
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1)
+    for i in range(events):
+        yield {
+            "title": " ".join(rng.sample(WORDS, 2) + rng.sample(RARE_WORDS, 1)).title(),
+            "description": " ".join(rng.choices(WORDS, k=25) + rng.choices(RARE_WORDS, k=5)),
+            "venue": rng.choice(VENUES),
+            "category_id": rng.randint(1, 6),
+            "date": start + timedelta(hours=rng.randint(0, 24 * 900)),
+            "status": "Approved",
+            "registered_count": 0,
+        }
+
+
+def timed(fn, queries):
+    samples = []
+    for q in queries:
+        start = time.perf_counter()
+        fn(q)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {"p50": statistics.median(samples), "p95": samples[int(len(samples) * 0.95) - 1], "max": samples[-1]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    # Runs against a throwaway SQLite file, never the configured database
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+    from app import create_app
+    from models import db, Event, Category
+    from search import search_events, rebuild_search_index, _search, _like_query, _terms
+    from migrate_db import apply_migrations
+
+    app = create_app(register_views=False)
+    with app.app_context():
+        with db.engine.begin() as conn:
+            apply_migrations(conn)
+        db.session.execute(db.insert(Category), [{"name": n} for n in
+                           ("Academic", "Sports", "Culture", "Workshop", "Seminar", "Hostel")])
+        start = time.perf_counter()
+        db.session.execute(db.insert(Event), list(generate(args.events)))
+        db.session.commit()
+        print(f"Inserted {args.events} events in {time.perf_counter() - start:.1f}s")
+
+        start = time.perf_counter()
+        with db.engine.begin() as conn:
+            rebuild_search_index(conn)
+        print(f"Built full-text index in {time.perf_counter() - start:.1f}s")
+
+        rng = random.Random(7)
+        queries = [" ".join(rng.sample(RARE_WORDS, 1) + rng.sample(WORDS, rng.randint(0, 1)))
+                   for _ in range(args.queries)]
+
+        fts = timed(lambda q: search_events(q), queries)
+        faceted = timed(lambda q: search_events(q, category_id=2, start=datetime(2024, 6, 1),
+                                                end=datetime(2025, 1, 1)), queries)
+        # Same search path with the unindexed LIKE scan in place of the full-text match
+        like = timed(lambda q: _search(_like_query(_terms(q)), None, None, None, 1, 20), queries[:20])
+
+    for name, result in (("fts", fts), ("fts+facets", faceted), ("like (20 queries)", like)):
+        print(f"{name:>18}: p50 {result['p50']:.1f}ms  p95 {result['p95']:.1f}ms  max {result['max']:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Measure cold-start cost: importing the app, building it, and serving the first request.
+
+Each run happens in a fresh interpreter so nothing is cached between runs.
+Exits non-zero when a median exceeds its budget. tests/test_startup.py
+enforces the same budgets under pytest; this script is for measuring.
+
+Usage:
+    python bench_startup.py --runs 5 --import-budget 1500 --first-request-budget 500
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Budgets in ms, shared with tests/test_startup.py
+IMPORT_BUDGET = 1500
+CREATE_APP_BUDGET = 250
+FIRST_REQUEST_BUDGET = 500
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def child():
+    # Runs in a fresh interpreter; prints one JSON line of timings in ms
+    start = time.perf_counter()
+    import app as app_module
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+    imported = time.perf_counter()
+
+    statements = []
+    event.listen(Engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    app = app_module.create_app()
+    created = time.perf_counter()
+    startup_statements = len(statements)
+
+    response = app.test_client().get("/")
+    served = time.perf_counter()
+    assert response.status_code == 200, response.status_code
+
+    print(json.dumps({
+        "import": (imported - start) * 1000,
+        "create_app": (created - imported) * 1000,
+        "first_request": (served - created) * 1000,
+        "startup_statements": startup_statements,
+    }))
+
+
+def prepare_env(directory):
+    """Environment for child runs: a throwaway SQLite file, never the configured database, with its schema built."""
+    env = dict(os.environ, DATABASE_URL="sqlite:///" + os.path.join(directory, "startup.db"),
+               NOTIFICATION_WORKER="off", EVENT_SCHEDULER="off")
+    subprocess.run([sys.executable, "-m", "flask", "--app", "app", "init-db"], env=env, check=True,
+                   stdout=subprocess.DEVNULL, cwd=REPO_DIR)
+    return env
+
+
+def run_child(env):
+    """Timings of one cold start in a fresh interpreter, as printed by child()."""
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child"], env=env, check=True,
+                         capture_output=True, text=True, cwd=REPO_DIR)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget", type=float, default=IMPORT_BUDGET, help="ms")
+    parser.add_argument("--create-app-budget", type=float, default=CREATE_APP_BUDGET, help="ms")
+    parser.add_argument("--first-request-budget", type=float, default=FIRST_REQUEST_BUDGET, help="ms")
+    args = parser.parse_args()
+
+    env = prepare_env(tempfile.mkdtemp())
+    runs = [run_child(env) for _ in range(args.runs)]
+
+    budgets = {"import": args.import_budget, "create_app": args.create_app_budget,
+               "first_request": args.first_request_budget}
+    failed = False
+    for name, budget in budgets.items():
+        median = statistics.median(r[name] for r in runs)
+        ok = median <= budget
+        failed |= not ok
+        print(f"{name:>14}: median {median:.0f}ms  max {max(r[name] for r in runs):.0f}ms  "
+              f"budget {budget:.0f}ms  {'ok' if ok else 'OVER BUDGET'}")
+
+    # create_app must not touch the database; schema work belongs to `flask init-db`
+    statements = max(r["startup_statements"] for r in runs)
+    print(f"SQL statements during create_app: {statements}")
+    failed |= statements > 0
+
+    print("FAIL" if failed else "PASS")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--child"]:
+        child()
+    else:
+        main()
@@ -0,0 +1,9 @@
+"""Fingerprint and precompress static files; run at deploy time before starting gunicorn."""
+from app import create_app
+from assets import build_assets
+
+app = create_app(register_views=False)
+
+if __name__ == "__main__":
+    manifest = build_assets(app.static_folder)
+    print(f"Built {len(manifest)} static asset(s) into static/build/.")
@@ -0,0 +1,184 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_TTL = 300
+
+
+class MemoryBackend:
+    """In-process LRU cache with per-entry expiry."""
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (value, time.time() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class SQLiteBackend:
+    """Cache stored in a local SQLite file, shared by every worker process on the host."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL)"
+        )
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute("SELECT value, expires FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return pickle.loads(row[0]), row[1]
+
+    def set(self, key, value, ttl):
+        conn = self._conn()
+        conn.execute("INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                     (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), time.time() + ttl))
+        # Opportunistically purge expired rows so the file doesn't grow forever
+        if hash(key) % 100 == 0:
+            conn.execute("DELETE FROM cache WHERE expires < ?", (time.time(),))
+
+    def delete(self, key):
+        self._conn().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self):
+        self._conn().execute("DELETE FROM cache")
+
+
+class NullBackend:
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def clear(self):
+        pass
+
+
+class Cache:
+    """Read-through cache with namespace versioning and hit/miss counters.
+
+    CACHE_BACKEND picks the store: 'memory' (per process, the default),
+    'sqlite' (a file at CACHE_SQLITE_PATH shared by all workers) or 'none'.
+    Keys built with `key()` embed the namespace's version, so `invalidate()`
+    drops every entry in a namespace by bumping that version. The memory
+    backend only invalidates within its own process; other workers see the
+    change once their entries expire, so keep CACHE_DEFAULT_TTL short there
+    or use the sqlite backend.
+    """
+
+    def __init__(self, app=None):
+        self.backend = NullBackend()
+        self.default_ttl = DEFAULT_TTL
+        self.hits = 0
+        self.misses = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('CACHE_BACKEND', 'memory')
+        app.config.setdefault('CACHE_DEFAULT_TTL', DEFAULT_TTL)
+        app.config.setdefault('CACHE_SQLITE_PATH', os.path.join(app.instance_path, 'cache.db'))
+        app.config.setdefault('CACHE_MAXSIZE', 1024)
+
+        kind = app.config['CACHE_BACKEND']
+        if kind == 'memory':
+            self.backend = MemoryBackend(app.config['CACHE_MAXSIZE'])
+        elif kind == 'sqlite':
+            self.backend = SQLiteBackend(app.config['CACHE_SQLITE_PATH'])
+        elif kind == 'none':
+            self.backend = NullBackend()
+        else:
+            raise ValueError(f"Unknown CACHE_BACKEND {kind!r}")
+        self.default_ttl = int(app.config['CACHE_DEFAULT_TTL'])
+        app.extensions['cache'] = self
+
+    def get_or_set(self, key, loader, ttl=None):
+        """Return the cached value for `key`, calling `loader()` to fill it on a miss.
+
+        A loader result of None is returned but not cached.
+        """
+        entry = self.backend.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        value = loader()
+        if value is not None:
+            self.backend.set(key, value, ttl or self.default_ttl)
+        return value
+
+    def delete(self, key):
+        self.backend.delete(key)
+
+    def version(self, namespace):
+        entry = self.backend.get(f"{namespace}:version")
+        if entry:
+            return entry[0]
+        # Never fall back to an old number if the version entry was evicted
+        return self.invalidate(namespace)
+
+    def key(self, namespace, *parts):
+        return ":".join([namespace, f"v{self.version(namespace)}", *map(str, parts)])
+
+    def invalidate(self, namespace):
+        # A fresh version number orphans every key built from the old one
+        version = time.time_ns()
+        self.backend.set(f"{namespace}:version", version, self.default_ttl * 10)
+        return version
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'backend': type(self.backend).__name__,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+cache = Cache()
@@ -0,0 +1,151 @@
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import render_template
+from models import db, Event, Registration, Student
+
+log = logging.getLogger(__name__)
+
+TEMPLATE = 'student_certificate.html'
+RENDER_BATCH_SIZE = 200
+
+
+def certificate_rows(event_id, student_id=None):
+    """Plain dicts with what the certificate template needs, one per Approved registration."""
+    query = (db.session.query(Registration.student_id, Student.username, Event.id, Event.title,
+                              Event.date, Event.venue, Event.status)
+             .join(Student, Student.id == Registration.student_id)
+             .join(Event, Event.id == Registration.event_id)
+             .filter(Registration.event_id == event_id, Registration.status == 'Approved')
+             .order_by(Registration.student_id))
+    if student_id is not None:
+        query = query.filter(Registration.student_id == student_id)
+    for sid, username, eid, title, date, venue, status in query:
+        yield {'student': {'id': sid, 'username': username},
+               'event': {'id': eid, 'title': title, 'date': date, 'venue': venue, 'status': status}}
+
+
+class CertificateStore:
+    """Rendered participation certificates, cached as HTML files.
+
+    Files live under CERTIFICATE_FOLDER as <template version>/<event_id>/<student_id>.html,
+    where the version is a hash of the template source: editing the template
+    moves every certificate to a new key instead of serving stale copies.
+    When an event is marked Completed its certificates are rendered in a
+    background pool; anything not rendered yet is written on first download.
+    CERTIFICATE_WORKER is 'thread' (default), 'sync' or 'off', as for
+    notifications.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._version = None
+        self._pool = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('CERTIFICATE_FOLDER', os.path.join(app.instance_path, 'certificates'))
+        app.config.setdefault('CERTIFICATE_WORKER', 'thread')
+        app.config.setdefault('CERTIFICATE_WORKERS', 2)
+        app.config.setdefault('CERTIFICATE_MAX_AGE', 24 * 3600)
+        app.extensions['certificates'] = self
+        self.app = app
+
+    @property
+    def version(self):
+        # Recomputed per call in debug so template edits show up without a restart
+        if self._version is None or self.app.debug:
+            source = self.app.jinja_env.loader.get_source(self.app.jinja_env, TEMPLATE)[0]
+            self._version = hashlib.sha256(source.encode()).hexdigest()[:12]
+        return self._version
+
+    def path(self, event_id, student_id):
+        return os.path.join(self.app.config['CERTIFICATE_FOLDER'], self.version, str(event_id), f"{student_id}.html")
+
+    # ----- rendering -----
+
+    def render(self, row):
+        # A fresh request context keeps the output identical whether it is
+        # rendered by a worker or on demand: no session, no per-user chrome
+        with self.app.test_request_context():
+            return render_template(TEMPLATE, **row)
+
+    def write(self, row, overwrite=False):
+        """Render one certificate to its cache file; returns the path."""
+        target = self.path(row['event']['id'], row['student']['id'])
+        if overwrite or not os.path.exists(target):
+            html = self.render(row)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            # Write then rename so downloads never see a half-written file
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target), prefix='.certificate-')
+            with os.fdopen(fd, 'w', encoding='utf-8') as out:
+                out.write(html)
+            os.replace(tmp, target)
+        return target
+
+    def _write_batch(self, rows, overwrite):
+        try:
+            for row in rows:
+                self.write(row, overwrite)
+        except Exception:
+            log.exception("Could not render certificates for event %s", rows[0]['event']['id'])
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.app.config['CERTIFICATE_WORKERS'],
+                                                thread_name_prefix='certificates')
+            return self._pool
+
+    def generate_event(self, event_id, overwrite=False):
+        """Render every Approved registrant's certificate for an event.
+
+        Rows are read here, in the caller's app context, and handed to the
+        pool in batches so a large event is spread over all workers. Returns
+        the batch futures (already finished in 'sync' mode).
+        """
+        mode = self.app.config['CERTIFICATE_WORKER']
+        if mode == 'off':
+            return []
+        futures, batch = [], []
+        for row in certificate_rows(event_id):
+            batch.append(row)
+            if len(batch) >= RENDER_BATCH_SIZE:
+                futures.append(self._submit(mode, batch, overwrite))
+                batch = []
+        if batch:
+            futures.append(self._submit(mode, batch, overwrite))
+        return [f for f in futures if f is not None]
+
+    def _submit(self, mode, rows, overwrite):
+        if mode == 'sync':
+            self._write_batch(rows, overwrite)
+            return None
+        return self._executor().submit(self._write_batch, rows, overwrite)
+
+    def generate_events(self, event_ids, overwrite=False):
+        futures = []
+        for event_id in event_ids:
+            futures.extend(self.generate_event(event_id, overwrite))
+        return futures
+
+    # ----- housekeeping -----
+
+    def prune(self):
+        """Delete certificates rendered from older template versions. Returns how many versions went."""
+        folder = self.app.config['CERTIFICATE_FOLDER']
+        if not os.path.isdir(folder):
+            return 0
+        stale = [name for name in os.listdir(folder) if name != self.version]
+        for name in stale:
+            shutil.rmtree(os.path.join(folder, name), ignore_errors=True)
+        return len(stale)
+
+
+certificates = CertificateStore()
@@ -0,0 +1,108 @@
+import zlib
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip is always available
+    brotli = None
+
+COMPRESSIBLE = {'text/html', 'text/csv', 'text/plain', 'text/css', 'text/javascript',
+                'application/javascript', 'application/json', 'image/svg+xml'}
+
+
+class _Gzip:
+    def __init__(self, level):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+
+    def process(self, data):
+        return self._obj.compress(data)
+
+    def flush(self):
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._obj.flush()
+
+
+class Compression:
+    """gzip/brotli Content-Encoding for dynamic responses.
+
+    Buffered responses are compressed when they are at least COMPRESS_MIN_SIZE
+    bytes. Streamed responses (CSV exports, streamed admin pages) have no
+    size up front and are always compressed, chunk by chunk, flushing after
+    each chunk so the client still sees rows as they are produced. Files
+    sent with send_file and anything already encoded are left alone; built
+    static assets ship precompressed (see assets.py).
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('COMPRESS', True)
+        app.config.setdefault('COMPRESS_MIN_SIZE', 1024)
+        app.config.setdefault('COMPRESS_GZIP_LEVEL', 6)
+        # Dynamic content: low brotli quality already beats gzip at a fraction of the CPU
+        app.config.setdefault('COMPRESS_BROTLI_QUALITY', 4)
+        app.extensions['compression'] = self
+        if app.config['COMPRESS']:
+            self.config = app.config
+            app.after_request(self._compress)
+
+    def _encoding(self):
+        accepted = request.accept_encodings
+        if brotli is not None and accepted['br']:
+            return 'br'
+        if accepted['gzip']:
+            return 'gzip'
+        return None
+
+    def _compressor(self, encoding):
+        if encoding == 'br':
+            return brotli.Compressor(quality=self.config['COMPRESS_BROTLI_QUALITY'])
+        return _Gzip(self.config['COMPRESS_GZIP_LEVEL'])
+
+    def _compress(self, response):
+        if (response.status_code != 200 or response.direct_passthrough
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE
+                or 'no-transform' in response.headers.get('Cache-Control', '')):
+            return response
+        streamed = response.is_streamed
+        if not streamed and (response.content_length or 0) < self.config['COMPRESS_MIN_SIZE']:
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = self._encoding()
+        if encoding is None or request.method == 'HEAD':
+            return response
+
+        compressor = self._compressor(encoding)
+        if streamed:
+            response.response = self._stream(response.response, compressor)
+            response.headers.pop('Content-Length', None)
+        else:
+            response.set_data(compressor.process(response.get_data()) + compressor.finish())
+        response.headers['Content-Encoding'] = encoding
+        # The encoded bytes differ from the identity ones; a weak validator still matches both
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    @staticmethod
+    def _stream(chunks, compressor):
+        try:
+            for chunk in chunks:
+                data = compressor.process(chunk.encode() if isinstance(chunk, str) else chunk)
+                data += compressor.flush()
+                if data:
+                    yield data
+            yield compressor.finish()
+        finally:
+            if hasattr(chunks, 'close'):
+                chunks.close()
+
+
+compression = Compression()
@@ -0,0 +1,183 @@
+import threading
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+from models import db
+from replicas import REPLICA_PREFIX
+
+ENGINE_DEFAULTS = {
+    'DB_POOL_SIZE': 5,
+    'DB_MAX_OVERFLOW': 10,
+    'DB_POOL_TIMEOUT': 30,
+    # Below MySQL's wait_timeout and any proxy idle timeout in front of it
+    'DB_POOL_RECYCLE': 1800,
+    'DB_POOL_PRE_PING': True,
+    'SQLITE_JOURNAL_MODE': 'wal',
+    'SQLITE_BUSY_TIMEOUT': 5000,  # ms a writer waits for the lock before "database is locked"
+    'SQLITE_SYNCHRONOUS': 'normal',
+    'SQLITE_MMAP_SIZE': 256 * 1024 * 1024,
+}
+JOURNAL_MODES = {'delete', 'truncate', 'persist', 'memory', 'wal', 'off'}
+SYNCHRONOUS_LEVELS = {'off', 'normal', 'full', 'extra'}
+
+
+class PoolMetrics:
+    """Process-wide connection pool counters, fed by pool events and TimedQueuePool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+
+    def _incr(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def stats(self, engines=()):
+        with self._lock:
+            stats = {
+                'connects': self.connects,
+                'checkouts': self.checkouts,
+                'checkins': self.checkins,
+                'invalidations': self.invalidations,
+                'timeouts': self.timeouts,
+                'wait_ms_total': round(self.wait_total * 1000, 3),
+                'wait_ms_avg': round(self.wait_total * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+                'wait_ms_max': round(self.wait_max * 1000, 3),
+            }
+        stats['pools'] = {name: _pool_status(engine.pool) for name, engine in engines}
+        return stats
+
+
+pool_metrics = PoolMetrics()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics._incr('timeouts')
+            raise
+        finally:
+            pool_metrics.record_wait(time.perf_counter() - start)
+
+
+def _pool_status(pool):
+    if not isinstance(pool, QueuePool):
+        return {'class': type(pool).__name__}
+    return {
+        'class': type(pool).__name__,
+        'size': pool.size(),
+        'checked_in': pool.checkedin(),
+        'checked_out': pool.checkedout(),
+        'overflow': pool.overflow(),
+    }
+
+
+def _is_sqlite_file(url):
+    return url.get_backend_name() == 'sqlite' and url.database not in (None, '', ':memory:') \
+        and url.query.get('mode') != 'memory'
+
+
+def engine_options(config, uri):
+    """SQLAlchemy engine options for `uri` built from the DB_* settings."""
+    url = make_url(uri)
+    if url.get_backend_name() == 'sqlite':
+        if not _is_sqlite_file(url):
+            return {}  # In-memory databases keep Flask-SQLAlchemy's StaticPool
+        # Local file: no stale connections to ping or recycle
+        return {
+            'poolclass': TimedQueuePool,
+            'pool_size': config['DB_POOL_SIZE'],
+            'max_overflow': config['DB_MAX_OVERFLOW'],
+            'pool_timeout': config['DB_POOL_TIMEOUT'],
+        }
+    return {
+        'poolclass': TimedQueuePool,
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': config['DB_POOL_PRE_PING'],
+    }
+
+
+def configure_engine(app):
+    """Fill SQLALCHEMY_ENGINE_OPTIONS from the DB_* settings; call before db.init_app.
+
+    Options already present in SQLALCHEMY_ENGINE_OPTIONS take precedence.
+    Each URL in DATABASE_REPLICA_URLS becomes a replica_<n> bind with the
+    same pool settings.
+    """
+    for key, value in ENGINE_DEFAULTS.items():
+        app.config.setdefault(key, value)
+    if app.config['SQLITE_JOURNAL_MODE'].lower() not in JOURNAL_MODES:
+        raise ValueError(f"Unknown SQLITE_JOURNAL_MODE {app.config['SQLITE_JOURNAL_MODE']!r}")
+    if app.config['SQLITE_SYNCHRONOUS'].lower() not in SYNCHRONOUS_LEVELS:
+        raise ValueError(f"Unknown SQLITE_SYNCHRONOUS {app.config['SQLITE_SYNCHRONOUS']!r}")
+
+    uri = app.config.get('SQLALCHEMY_DATABASE_URI')
+    if uri:
+        options = engine_options(app.config, uri)
+        options.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+    binds = app.config.setdefault('SQLALCHEMY_BINDS', {})
+    for i, url in enumerate(app.config.get('DATABASE_REPLICA_URLS') or []):
+        binds.setdefault(f"{REPLICA_PREFIX}{i}", {'url': url, **engine_options(app.config, url)})
+
+
+def _sqlite_pragmas(config):
+    pragmas = (
+        f"PRAGMA journal_mode={config['SQLITE_JOURNAL_MODE'].lower()}",
+        f"PRAGMA busy_timeout={int(config['SQLITE_BUSY_TIMEOUT'])}",
+        f"PRAGMA synchronous={config['SQLITE_SYNCHRONOUS'].lower()}",
+        f"PRAGMA mmap_size={int(config['SQLITE_MMAP_SIZE'])}",
+    )
+
+    def set_pragmas(dbapi_conn, record):
+        cursor = dbapi_conn.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+    return set_pragmas
+
+
+def init_engine_events(app):
+    """Attach SQLite pragmas and pool metrics to every engine; call after db.init_app.
+
+    Creating the engines here does not open a connection.
+    """
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        if _is_sqlite_file(engine.url):
+            event.listen(engine, 'connect', _sqlite_pragmas(app.config))
+        event.listen(engine, 'connect', lambda *args: pool_metrics._incr('connects'))
+        event.listen(engine, 'checkout', lambda *args: pool_metrics._incr('checkouts'))
+        event.listen(engine, 'checkin', lambda *args: pool_metrics._incr('checkins'))
+        event.listen(engine, 'invalidate', lambda *args: pool_metrics._incr('invalidations'))
+
+
+def pool_stats():
+    """Pool counters plus the live state of each engine's pool; needs an app context."""
+    return pool_metrics.stats((key or 'default', engine) for key, engine in db.engines.items())
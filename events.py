@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta
+from flask import abort, current_app
+from sqlalchemy import or_
+from cache import cache
+from models import db, Event
+from pagination import keyset_paginate, KeysetPage, decode_cursor
+from replicas import primary
+
+# Cached values are plain dicts so they can be pickled into a shared backend
+# and outlive the request's session; templates read them like model objects.
+# Fills read from the primary: a lagging replica must not repopulate an
+# entry that a write has just invalidated.
+EVENT_FIELDS = ('id', 'title', 'description', 'date', 'venue', 'location', 'status',
+                'capacity', 'registered_count', 'image_file', 'category_id', 'coordinator_id',
+                'announcements', 'results', 'updated_at')
+# Events have no end time: one counts as over this long after it starts
+COMPLETE_AFTER_HOURS = 6
+# What anyone may see; proposed and rejected events only reach admins and their coordinator
+PUBLIC_STATUSES = ('Approved', 'Completed')
+
+
+def event_data(event):
+    return {field: getattr(event, field) for field in EVENT_FIELDS}
+
+
+def visibility_filter(identity):
+    """A clause limiting events to those the viewer may see, or None for no limit.
+
+    `identity` is current_identity(): admins see everything, coordinators
+    also their own events, everyone else PUBLIC_STATUSES only.
+    """
+    role = identity['role'] if identity else None
+    if role == 'admin':
+        return None
+    clause = Event.status.in_(PUBLIC_STATUSES)
+    if role == 'coordinator':
+        clause = or_(clause, Event.coordinator_id == identity['id'])
+    return clause
+
+
+def completion_cutoff(config, now=None):
+    """Approved events starting before this are over: the scheduler completes them and the index drops them."""
+    hours = config.get('EVENT_COMPLETE_AFTER_HOURS', COMPLETE_AFTER_HOURS)
+    return (now or datetime.utcnow()) - timedelta(hours=hours)
+
+
+def _cached_page(parts, query, per_page, cursor, descending=False):
+    # Only the first page is cached: it takes nearly all the traffic, and
+    # cursors are client-supplied, so keying on them would let anyone fill the
+    # cache with made-up (date, id) pairs. Later pages are a single index
+    # range scan each. An invalid cursor decodes to None and gets page 1.
+    if decode_cursor(cursor, [Event.date, Event.id]) is not None:
+        page = keyset_paginate(query(), [Event.date, Event.id], cursor=cursor, per_page=per_page,
+                               descending=descending)
+        return KeysetPage([event_data(e) for e in page.items], page.next_cursor, page.prev_cursor)
+
+    def load():
+        with primary():
+            page = keyset_paginate(query(), [Event.date, Event.id], per_page=per_page, descending=descending)
+        return {'items': [event_data(e) for e in page.items],
+                'next_cursor': page.next_cursor, 'prev_cursor': page.prev_cursor}
+
+    data = cache.get_or_set(cache.key('events', *parts, per_page), load)
+    return KeysetPage(data['items'], data['next_cursor'], data['prev_cursor'])
+
+
+def event_page(cursor=None, per_page=6, status='Approved'):
+    """A page of events with `status`, soonest first; the first page is served from cache.
+
+    Approved events are listed until they are over; the other statuses are
+    never completed, so their past-dated events stay listed for admins to
+    act on. Equality on status plus a range on date: one scan of
+    ix_events_status_date.
+    """
+    def query():
+        query = Event.query.filter(Event.status == status)
+        if status == 'Approved':
+            query = query.filter(Event.date >= completion_cutoff(current_app.config))
+        return query
+
+    return _cached_page(('index', status), query, per_page, cursor)
+
+
+def archive_page(cursor=None, per_page=12):
+    """A page of Completed events, most recent first; the first page is served from cache."""
+    def query():
+        return Event.query.filter(Event.status == 'Completed')
+
+    return _cached_page(('archive',), query, per_page, cursor, descending=True)
+
+
+def _detail_key(event_id):
+    return cache.key('events', 'detail', event_id)
+
+
+def event_detail_or_404(event_id):
+    """A single event's data, served from cache when possible."""
+    def load():
+        with primary():
+            event = db.session.get(Event, event_id)
+        return event_data(event) if event else None
+
+    data = cache.get_or_set(_detail_key(event_id), load)
+    if data is None:
+        abort(404)
+    return data
+
+
+def invalidate_events():
+    """Drop every cached event list page and detail entry."""
+    cache.invalidate('events')
+
+
+def invalidate_event_detail(event_id):
+    """Drop one event's detail entry, e.g. after its registration count changed."""
+    cache.delete(_detail_key(event_id))
@@ -0,0 +1,67 @@
+import csv
+import zlib
+from io import StringIO
+from flask import Response, stream_with_context
+from models import Registration
+from queries import with_student, iter_batched
+
+EXPORT_BATCH_SIZE = 1000
+
+
+def iter_registrations(query, batch_size=EXPORT_BATCH_SIZE):
+    """Yield registrations from `query` in id-ordered batches, with flat memory."""
+    return iter_batched(query, Registration.id, batch_size)
+
+
+def iter_csv(header, rows, batch_size=EXPORT_BATCH_SIZE):
+    """Encode rows as CSV text, yielding one chunk per `batch_size` rows."""
+    buf = StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(header)
+    for i, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if i % batch_size == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue()
+
+
+def _gzip_chunks(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def csv_response(filename, header, rows, gzip=False):
+    """Stream CSV rows to the client, optionally gzip-compressed."""
+    chunks = iter_csv(header, rows)
+    if gzip:
+        body = _gzip_chunks(chunks)
+        filename += ".gz"
+        mimetype = "application/gzip"
+    else:
+        body = (chunk.encode() for chunk in chunks)
+        mimetype = "text/csv"
+    response = Response(stream_with_context(body), mimetype=mimetype)
+    response.headers["Content-Disposition"] = f"attachment; filename={filename}"
+    return response
+
+
+PARTICIPANT_HEADER = ['Student Username', 'Email', 'Registration Date', 'Status']
+REGISTRATION_HEADER = ['Event ID', 'Event Title', 'Event Date', 'Student Username', 'Email', 'Registration Date', 'Status']
+
+
+def participant_rows(event_id):
+    query = Registration.query.options(with_student()).filter(Registration.event_id == event_id)
+    for reg in iter_registrations(query):
+        yield [reg.student.username, reg.student.email, reg.created_at.strftime('%Y-%m-%d %H:%M'), reg.status]
+
+
+def registration_rows(query):
+    for reg in iter_registrations(query):
+        yield [reg.event.id, reg.event.title, reg.event.date.strftime('%Y-%m-%d %H:%M'),
+               reg.student.username, reg.student.email, reg.created_at.strftime('%Y-%m-%d %H:%M'), reg.status]
@@ -0,0 +1,22 @@
+"""Render missing certificates for every Completed event and drop ones from older template versions.
+
+Useful after deploying a template change, or when CERTIFICATE_WORKER is off.
+Pass --overwrite to re-render certificates that already exist.
+"""
+import sys
+from concurrent.futures import wait
+from app import create_app
+from models import Event
+from certificates import certificates
+
+app = create_app()
+
+if __name__ == "__main__":
+    app.config['CERTIFICATE_WORKER'] = 'thread'
+    with app.app_context():
+        event_ids = [eid for (eid,) in Event.query.with_entities(Event.id).filter(Event.status == 'Completed')]
+        futures = certificates.generate_events(event_ids, overwrite='--overwrite' in sys.argv[1:])
+        wait(futures)
+        pruned = certificates.prune()
+    print(f"Certificates ready for {len(event_ids)} event(s) (template {certificates.version}); "
+          f"removed {pruned} old version(s).")
@@ -0,0 +1,174 @@
+"""Fill the database with synthetic students, coordinators, events, registrations and notifications.
+
+Rows are written with batched executemany inserts and explicit ids, so a
+million rows load in seconds on SQLite. Run `flask --app app init-db` first.
+Every generated account has the password "password"; an admin named
+"admin" is created if missing.
+
+Usage:
+    python generate_data.py --students 100000 --events 5000 --registrations 800000 --notifications 100000
+"""
+import argparse
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from sqlalchemy import func, insert
+from app import create_app
+from models import db, Admin, Category, Coordinator, Event, Notification, Registration, Student
+from migrate_db import backfill_registered_counts
+from search import rebuild_search_index
+from auth import hash_password
+
+PASSWORD = "password"
+BATCH_SIZE = 20_000
+CATEGORIES = ["Academic", "Sports", "Culture", "Workshop", "Seminar", "Hostel"]
+WORDS = ("robotics hackathon music festival football cricket seminar workshop quantum physics poetry "
+         "debate chess drama dance photography startup finance marketing chemistry biology yoga").split()
+VENUES = ["Main Hall", "Auditorium", "Lab Block", "Sports Ground", "Library", "Open Air Theatre"]
+EVENT_STATUSES = ["Approved"] * 7 + ["Proposed", "Rejected", "Completed"]
+REGISTRATION_STATUSES = ["Pending", "Approved", "Approved", "Rejected"]
+
+
+def next_id(model):
+    return (db.session.query(func.max(model.id)).scalar() or 0) + 1
+
+
+def bulk_insert(conn, model, rows):
+    """Insert an iterable of row dicts in batches; returns the number of rows."""
+    count, batch = 0, []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            conn.execute(insert(model), batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        conn.execute(insert(model), batch)
+        count += len(batch)
+    return count
+
+
+@contextmanager
+def indexes_dropped(conn, model):
+    # Building an index once after the load beats updating it row by row
+    indexes = list(model.__table__.indexes)
+    for index in indexes:
+        index.drop(conn, checkfirst=True)
+    yield
+    for index in indexes:
+        index.create(conn)
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:>14}: {count:>9} rows in {elapsed:5.1f}s ({count / elapsed if elapsed else 0:,.0f} rows/s)")
+    return count
+
+
+def generate(args):
+    rng = random.Random(args.seed)
+    now = datetime.utcnow()
+    # Hash once: every generated account shares the same password
+    student_hash = hash_password('student', PASSWORD)
+    coordinator_hash = hash_password('coordinator', PASSWORD)
+
+    for name in CATEGORIES:
+        if not Category.query.filter_by(name=name).first():
+            db.session.add(Category(name=name))
+    if not Admin.query.filter_by(username="admin").first():
+        admin = Admin(username="admin")
+        admin.set_password(PASSWORD)
+        db.session.add(admin)
+    db.session.commit()
+    category_ids = [c.id for c in Category.query.all()]
+
+    first_student, first_coordinator = next_id(Student), next_id(Coordinator)
+    first_event = next_id(Event)
+    student_ids = range(first_student, first_student + args.students)
+    coordinator_ids = range(first_coordinator, first_coordinator + args.coordinators)
+    event_ids = range(first_event, first_event + args.events)
+
+    def students():
+        for i in student_ids:
+            yield {"id": i, "username": f"student{i}", "email": f"student{i}@example.com",
+                   "password_hash": student_hash, "created_at": now - timedelta(minutes=rng.randint(0, 500_000))}
+
+    def coordinators():
+        for i in coordinator_ids:
+            yield {"id": i, "username": f"coordinator{i}", "password_hash": coordinator_hash,
+                   "department": rng.choice(CATEGORIES), "created_at": now}
+
+    def events():
+        for i in event_ids:
+            venue = rng.choice(VENUES)
+            yield {"id": i, "title": " ".join(rng.sample(WORDS, 3)).title(),
+                   "description": " ".join(rng.choices(WORDS, k=30)),
+                   "category_id": rng.choice(category_ids),
+                   "date": now + timedelta(hours=rng.randint(-24 * 365, 24 * 180)),
+                   "venue": venue, "location": venue,
+                   "coordinator_id": rng.choice(coordinator_ids) if coordinator_ids else None,
+                   "status": rng.choice(EVENT_STATUSES), "image_file": "default.jpg",
+                   "capacity": None, "registered_count": 0,
+                   "created_at": now - timedelta(days=rng.randint(0, 400)), "updated_at": now}
+
+    def registrations():
+        # Spread registrations over events, unique per (student, event)
+        if not event_ids or not student_ids:
+            return
+        per_event = min(len(student_ids), max(1, args.registrations // len(event_ids)))
+        remaining = args.registrations
+        for event_id in event_ids:
+            if remaining <= 0:
+                break
+            for student_id in rng.sample(student_ids, min(per_event, remaining)):
+                status = rng.choice(REGISTRATION_STATUSES)
+                created = now - timedelta(minutes=rng.randint(0, 500_000))
+                yield {"student_id": student_id, "event_id": event_id, "status": status, "created_at": created,
+                       "approved_at": created if status == "Approved" else None, "updated_at": created}
+            remaining -= per_event
+
+    def notifications():
+        if not student_ids:
+            return
+        for _ in range(args.notifications):
+            yield {"student_id": rng.choice(student_ids),
+                   "message": f"Your registration for {rng.choice(WORDS).title()} has been approved.",
+                   "is_read": rng.random() < 0.7,
+                   "created_at": now - timedelta(minutes=rng.randint(0, 500_000))}
+
+    db.session.close()
+    total = 0
+    start = time.perf_counter()
+    with db.engine.begin() as conn:
+        total += timed("students", lambda: bulk_insert(conn, Student, students()))
+        total += timed("coordinators", lambda: bulk_insert(conn, Coordinator, coordinators()))
+        total += timed("events", lambda: bulk_insert(conn, Event, events()))
+        with indexes_dropped(conn, Registration):
+            total += timed("registrations", lambda: bulk_insert(conn, Registration, registrations()))
+        with indexes_dropped(conn, Notification):
+            total += timed("notifications", lambda: bulk_insert(conn, Notification, notifications()))
+        backfill_registered_counts(conn)
+        rebuild_search_index(conn)
+    print(f"Inserted {total} rows in {time.perf_counter() - start:.1f}s (including counters and search index).")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=10_000)
+    parser.add_argument("--coordinators", type=int, default=50)
+    parser.add_argument("--events", type=int, default=1_000)
+    parser.add_argument("--registrations", type=int, default=100_000)
+    parser.add_argument("--notifications", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    app = create_app(register_views=False)
+    with app.app_context():
+        generate(args)
+
+
+if __name__ == "__main__":
+    main()
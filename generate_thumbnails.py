@@ -0,0 +1,13 @@
+"""Generate missing resized variants for every image already in static/uploads."""
+import os
+from app import create_app
+from uploads import generate_variants, IMAGE_EXTENSIONS
+
+app = create_app(register_views=False)
+
+if __name__ == "__main__":
+    folder = app.config['UPLOAD_FOLDER']
+    for name in sorted(os.listdir(folder)):
+        if '.' in name and name.rsplit('.', 1)[1].lower() in IMAGE_EXTENSIONS:
+            generate_variants(folder, name)
+            print(f"Variants ready for {name}")
@@ -0,0 +1,89 @@
+from flask import current_app, g, session
+from cache import cache
+from models import db, Admin, Coordinator, Student
+from replicas import primary
+
+# role -> (model, session key, display fields). Login clears the session, so
+# at most one role is logged in at a time.
+ROLES = {
+    'admin': (Admin, 'admin_id', ('username',)),
+    'coordinator': (Coordinator, 'coordinator_id', ('username', 'department')),
+    'student': (Student, 'student_id', ('username',)),
+}
+IDENTITY_CACHE_TTL = 30
+
+
+def _session_role():
+    for role, (model, key, fields) in ROLES.items():
+        if session.get(key):
+            return role, session[key]
+    return None, None
+
+
+def _identity_key(role, user_id):
+    return cache.key('identity', role, user_id)
+
+
+def _load_identity(role, user_id):
+    model, key, fields = ROLES[role]
+    with primary():
+        row = db.session.query(*(getattr(model, f) for f in fields)).filter(model.id == user_id).first()
+    if row is None:
+        return None
+    return {'role': role, 'id': user_id, **dict(zip(fields, row))}
+
+
+def current_identity(role=None):
+    """Display data of the logged-in user, e.g. {'role': 'student', 'id': 3, 'username': 'sam'}.
+
+    Resolved once per request and kept on g; across requests it is cached for
+    IDENTITY_CACHE_TTL seconds (0 turns that off), so pages that only show a
+    name don't touch the database. Returns None when nobody is logged in, the
+    account no longer exists, or `role` is given and doesn't match.
+    """
+    if 'identity' not in g:
+        user_role, user_id = _session_role()
+        ttl = current_app.config['IDENTITY_CACHE_TTL']
+        if user_role is None:
+            g.identity = None
+        elif ttl:
+            g.identity = cache.get_or_set(_identity_key(user_role, user_id),
+                                          lambda: _load_identity(user_role, user_id), ttl)
+        else:
+            g.identity = _load_identity(user_role, user_id)
+    identity = g.identity
+    if identity is None or (role and identity['role'] != role):
+        return None
+    return identity
+
+
+def current_user(role=None):
+    """The logged-in Admin, Coordinator or Student instance, loaded at most once per request.
+
+    For views that change or traverse the account; showing it only needs
+    current_identity().
+    """
+    identity = current_identity(role)
+    if identity is None:
+        return None
+    if 'current_user' not in g:
+        model, key, fields = ROLES[identity['role']]
+        g.current_user = db.session.get(model, identity['id'])
+    return g.current_user
+
+
+def forget_identity(role, user_id):
+    """Drop a cached identity, e.g. after the account was deleted.
+
+    With the per-process memory cache other workers keep their copy until it
+    expires, which IDENTITY_CACHE_TTL bounds.
+    """
+    cache.delete(_identity_key(role, user_id))
+
+
+def init_identity(app):
+    app.config.setdefault('IDENTITY_CACHE_TTL', IDENTITY_CACHE_TTL)
+
+    @app.context_processor
+    def inject_identity():
+        return {'current_identity': current_identity()}
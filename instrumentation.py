@@ -0,0 +1,288 @@
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from flask import g, has_request_context, request, Response, template_rendered, before_render_template
+from sqlalchemy import event
+from models import db
+
+log = logging.getLogger(__name__)
+
+# Request duration histogram buckets, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+class RequestStats:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.statements = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self._template_starts = []
+        # statement -> {params repr -> count}, and the first place each statement came from
+        self.executions = defaultdict(lambda: defaultdict(int))
+        self.origins = {}
+
+    def repeated(self, threshold):
+        """(kind, statement, count, origin) for duplicate and N+1 statements."""
+        found = []
+        for statement, by_params in self.executions.items():
+            total = sum(by_params.values())
+            if max(by_params.values()) > 1:
+                found.append(('duplicate', statement, total, self.origins.get(statement)))
+            elif len(by_params) >= threshold:
+                found.append(('n+1', statement, total, self.origins.get(statement)))
+        return found
+
+
+def _origin():
+    """'template.html:12' for the innermost template frame, else the innermost app source line."""
+    frame = sys._getframe(2)
+    source = None
+    while frame is not None:
+        template = frame.f_globals.get('__jinja_template__')
+        if template is not None:
+            return f"{template.name or '<string>'}:{template.get_corresponding_lineno(frame.f_lineno)}"
+        filename = frame.f_code.co_filename
+        if source is None and filename.startswith(ROOT) and filename != __file__ \
+                and os.sep + 'site-packages' + os.sep not in filename:
+            source = f"{os.path.relpath(filename, ROOT)}:{frame.f_lineno}"
+        frame = frame.f_back
+    return source
+
+
+class EndpointMetrics:
+    """Cumulative per-endpoint counters in the shape Prometheus expects."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = defaultdict(int)        # (endpoint, method, status)
+        self.duration = defaultdict(float)      # endpoint -> seconds
+        self.buckets = defaultdict(lambda: [0] * len(BUCKETS))
+        self.count = defaultdict(int)
+        self.statements = defaultdict(int)
+        self.db_time = defaultdict(float)
+        self.template_time = defaultdict(float)
+        self.response_bytes = defaultdict(int)
+        self.repeated = defaultdict(int)        # (endpoint, kind)
+
+    def record(self, endpoint, method, status, duration, stats, size, repeated):
+        with self._lock:
+            self.requests[(endpoint, method, status)] += 1
+            self.duration[endpoint] += duration
+            self.count[endpoint] += 1
+            for i, bound in enumerate(BUCKETS):
+                if duration <= bound:
+                    self.buckets[endpoint][i] += 1
+            self.statements[endpoint] += stats.statements
+            self.db_time[endpoint] += stats.db_time
+            self.template_time[endpoint] += stats.template_time
+            self.response_bytes[endpoint] += size
+            for kind, *_ in repeated:
+                self.repeated[(endpoint, kind)] += 1
+
+    def render(self):
+        lines = []
+        with self._lock:
+            _family(lines, "app_requests_total", "counter", "Requests handled.",
+                    [("", {"endpoint": e, "method": m, "status": s}, n)
+                     for (e, m, s), n in sorted(self.requests.items())])
+            histogram = []
+            for endpoint in sorted(self.count):
+                for bound, n in zip(BUCKETS, self.buckets[endpoint]):
+                    histogram.append(("_bucket", {"endpoint": endpoint, "le": bound}, n))
+                histogram.append(("_bucket", {"endpoint": endpoint, "le": "+Inf"}, self.count[endpoint]))
+                histogram.append(("_sum", {"endpoint": endpoint}, f"{self.duration[endpoint]:.6f}"))
+                histogram.append(("_count", {"endpoint": endpoint}, self.count[endpoint]))
+            _family(lines, "app_request_duration_seconds", "histogram", "Request duration.", histogram)
+            _family(lines, "app_db_statements_total", "counter", "SQL statements executed.",
+                    [("", {"endpoint": e}, n) for e, n in sorted(self.statements.items())])
+            _family(lines, "app_db_seconds_total", "counter", "Time spent executing SQL.",
+                    [("", {"endpoint": e}, f"{n:.6f}") for e, n in sorted(self.db_time.items())])
+            _family(lines, "app_template_seconds_total", "counter", "Time spent rendering templates.",
+                    [("", {"endpoint": e}, f"{n:.6f}") for e, n in sorted(self.template_time.items())])
+            _family(lines, "app_response_bytes_total", "counter", "Response body bytes.",
+                    [("", {"endpoint": e}, n) for e, n in sorted(self.response_bytes.items())])
+            _family(lines, "app_repeated_queries_total", "counter", "Requests with duplicate or N+1 queries.",
+                    [("", {"endpoint": e, "kind": k}, n) for (e, k), n in sorted(self.repeated.items())])
+        return lines
+
+
+def _family(lines, name, kind, help_text, samples):
+    # Prometheus text format; samples are (name suffix, labels, value)
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+    for suffix, labels, value in samples:
+        label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+        lines.append(f"{name}{suffix}{{{label_text}}} {value}" if label_text else f"{name}{suffix} {value}")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Instrumentation:
+    """Opt-in per-request performance instrumentation.
+
+    With INSTRUMENTATION enabled, every request records its SQL statement count,
+    DB time, template render time and response size. Repeated statements are
+    flagged as duplicates (same SQL and parameters) or N+1 patterns (same SQL,
+    different parameters), with the template line or view line that issued them.
+    Results go out as a Server-Timing header (buffered responses only), as
+    Prometheus metrics on /metrics and, for a sample of requests, as lines in
+    a JSONL file. Streamed responses are recorded once their body is sent.
+
+    Metrics are kept per process; with several gunicorn workers each scrape sees
+    the worker that answered it.
+    """
+
+    def __init__(self, app=None):
+        self.metrics = EndpointMetrics()
+        self._sample_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('INSTRUMENTATION', False)
+        app.config.setdefault('INSTRUMENTATION_NPLUSONE_THRESHOLD', 5)
+        app.config.setdefault('INSTRUMENTATION_SAMPLE_RATE', 0.0)
+        app.config.setdefault('INSTRUMENTATION_SAMPLE_PATH', os.path.join(app.instance_path, 'requests.jsonl'))
+        app.extensions['instrumentation'] = self
+        if not app.config['INSTRUMENTATION']:
+            return
+
+        self.threshold = app.config['INSTRUMENTATION_NPLUSONE_THRESHOLD']
+        self.sample_rate = app.config['INSTRUMENTATION_SAMPLE_RATE']
+        self.sample_path = app.config['INSTRUMENTATION_SAMPLE_PATH']
+
+        with app.app_context():
+            engines = list(db.engines.values())
+        for engine in engines:
+            event.listen(engine, 'before_cursor_execute', self._before_execute)
+            event.listen(engine, 'after_cursor_execute', self._after_execute)
+        before_render_template.connect(self._before_render, app)
+        template_rendered.connect(self._after_render, app)
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+
+    # ----- collection -----
+
+    def _start(self):
+        g.instrumentation = RequestStats()
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_start'].pop()
+        stats = g.get('instrumentation') if has_request_context() else None
+        if stats is None:
+            return
+        stats.statements += 1
+        stats.db_time += elapsed
+        stats.executions[statement][repr(parameters)] += 1
+        if statement not in stats.origins:
+            stats.origins[statement] = _origin()
+
+    def _before_render(self, sender, template, context, **extra):
+        stats = g.get('instrumentation')
+        if stats is not None:
+            stats._template_starts.append(time.perf_counter())
+
+    def _after_render(self, sender, template, context, **extra):
+        stats = g.get('instrumentation')
+        if stats is not None and stats._template_starts:
+            stats.template_time += time.perf_counter() - stats._template_starts.pop()
+
+    def _finish(self, response):
+        stats = g.get('instrumentation')
+        if stats is None or request.endpoint == 'metrics':
+            g.pop('instrumentation', None)
+            return response
+        info = (request.endpoint or 'unmatched', request.method, request.path, response.status_code)
+
+        if response.is_streamed and not response.direct_passthrough:
+            # The body (CSV exports, streamed pages, compression) hasn't run yet:
+            # record once it has been sent. The stats stay on g so queries made
+            # while streaming under stream_with_context are still counted.
+            # Headers are already out by then, so there is no Server-Timing.
+            response.response = self._measure_stream(response.response, stats, info)
+            return response
+
+        g.pop('instrumentation', None)
+        duration = time.perf_counter() - stats.start
+        response.headers.add('Server-Timing', ", ".join((
+            f'db;dur={stats.db_time * 1000:.1f};desc="{stats.statements} queries"',
+            f'tpl;dur={stats.template_time * 1000:.1f}',
+            f'app;dur={duration * 1000:.1f}',
+        )))
+        self._record(stats, info, duration, response.content_length or 0)
+        return response
+
+    def _measure_stream(self, chunks, stats, info):
+        size = 0
+        try:
+            for chunk in chunks:
+                size += len(chunk.encode() if isinstance(chunk, str) else chunk)
+                yield chunk
+        finally:
+            if hasattr(chunks, 'close'):
+                chunks.close()
+            self._record(stats, info, time.perf_counter() - stats.start, size)
+
+    def _record(self, stats, info, duration, size):
+        endpoint, method, path, status = info
+        repeated = stats.repeated(self.threshold)
+        for kind, statement, count, origin in repeated:
+            log.warning("%s query on %s (%dx) from %s: %s", kind, endpoint, count, origin or '?', statement)
+
+        self.metrics.record(endpoint, method, status, duration, stats, size, repeated)
+        if self.sample_rate and random.random() < self.sample_rate:
+            self._sample(info, duration, stats, size, repeated)
+
+    def _sample(self, info, duration, stats, size, repeated):
+        endpoint, method, path, status = info
+        record = {
+            'ts': time.time(),
+            'endpoint': endpoint,
+            'method': method,
+            'path': path,
+            'status': status,
+            'duration_ms': round(duration * 1000, 3),
+            'db_statements': stats.statements,
+            'db_ms': round(stats.db_time * 1000, 3),
+            'template_ms': round(stats.template_time * 1000, 3),
+            'response_bytes': size,
+            'repeated': [{'kind': kind, 'statement': statement, 'count': count, 'origin': origin}
+                         for kind, statement, count, origin in repeated],
+        }
+        line = json.dumps(record, default=str) + "\n"
+        with self._sample_lock:
+            with open(self.sample_path, 'a') as f:
+                f.write(line)
+
+    # ----- export -----
+
+    def metrics_view(self):
+        from database import pool_metrics
+        from cache import cache
+
+        lines = self.metrics.render()
+        pool = pool_metrics.stats()
+        for name in ('connects', 'checkouts', 'timeouts', 'invalidations'):
+            _family(lines, f"app_db_pool_{name}_total", "counter", f"Connection pool {name}.", [("", {}, pool[name])])
+        _family(lines, "app_db_pool_wait_seconds_total", "counter", "Time spent waiting for a pooled connection.",
+                [("", {}, f"{pool['wait_ms_total'] / 1000:.6f}")])
+        cache_stats = cache.stats()
+        for name in ('hits', 'misses'):
+            _family(lines, f"app_cache_{name}_total", "counter", f"Cache {name}.", [("", {}, cache_stats[name])])
+        return Response("\n".join(lines) + "\n", mimetype='text/plain; version=0.0.4')
+
+
+instrumentation = Instrumentation()
@@ -0,0 +1,91 @@
+import logging
+import threading
+import time
+from models import db, Event
+from registrations import set_event_status
+from events import invalidate_events, completion_cutoff, COMPLETE_AFTER_HOURS
+
+log = logging.getLogger(__name__)
+
+COMPLETE_BATCH_SIZE = 500
+SCHEDULER_INTERVAL = 300
+
+
+def complete_past_events(app, now=None, batch_size=COMPLETE_BATCH_SIZE):
+    """Move Approved events that are over to Completed. Returns how many changed.
+
+    Ids come off the (status, date) index a batch at a time and each batch is
+    one UPDATE in its own transaction, through set_event_status so that
+    registrants are notified and certificates queued as for a manual
+    completion. Safe to run from several processes: a row already Completed
+    is skipped by the UPDATE.
+    """
+    cutoff = completion_cutoff(app.config, now)
+    total = 0
+    while True:
+        event_ids = [eid for (eid,) in db.session.query(Event.id)
+                     .filter(Event.status == 'Approved', Event.date < cutoff)
+                     .order_by(Event.date, Event.id)
+                     .limit(batch_size)]
+        if not event_ids:
+            break
+        total += set_event_status('Completed', event_ids)
+        if len(event_ids) < batch_size:
+            break
+    if total:
+        invalidate_events()
+    return total
+
+
+class LifecycleScheduler:
+    """Runs complete_past_events every EVENT_SCHEDULER_INTERVAL seconds.
+
+    EVENT_SCHEDULER selects the mode: 'off' (default) leaves the work to
+    lifecycle_worker.py, one process for the whole deployment (the
+    Procfile's scheduler). 'thread' starts a daemon thread in each app
+    process on its first request; meant for a single-process dev server,
+    as every gunicorn worker would run its own.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._thread = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('EVENT_SCHEDULER', 'off')
+        app.config.setdefault('EVENT_SCHEDULER_INTERVAL', SCHEDULER_INTERVAL)
+        app.config.setdefault('EVENT_COMPLETE_AFTER_HOURS', COMPLETE_AFTER_HOURS)
+        app.extensions['event_scheduler'] = self
+        self.app = app
+        if app.config['EVENT_SCHEDULER'] == 'thread':
+            # Started lazily so scripts and CLI commands never spawn it
+            app.before_request(self._ensure_thread)
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name='event-scheduler', daemon=True)
+                self._thread.start()
+
+    def run_once(self):
+        with self.app.app_context():
+            changed = complete_past_events(self.app)
+        if changed:
+            log.info("Marked %d past event(s) Completed", changed)
+        return changed
+
+    def _loop(self):
+        while True:
+            try:
+                self.run_once()
+            except Exception:
+                log.exception("Event scheduler run failed")
+            time.sleep(self.app.config['EVENT_SCHEDULER_INTERVAL'])
+
+
+scheduler = LifecycleScheduler()
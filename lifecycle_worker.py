@@ -0,0 +1,24 @@
+"""Move past events to Completed on a schedule, in a separate process.
+
+Run exactly one of these (the Procfile's scheduler process) with the default
+EVENT_SCHEDULER=off, so a single process does the work instead of a thread
+in every web worker. Pass --once to run a single pass,
+e.g. from cron.
+"""
+import sys
+import time
+from app import create_app
+from lifecycle import complete_past_events
+
+# With views: completing events renders certificates, which link back into the site
+app = create_app()
+
+if __name__ == "__main__":
+    while True:
+        with app.app_context():
+            changed = complete_past_events(app)
+        if changed:
+            print(f"Marked {changed} past event(s) Completed.")
+        if '--once' in sys.argv[1:]:
+            break
+        time.sleep(app.config['EVENT_SCHEDULER_INTERVAL'])
@@ -0,0 +1,115 @@
+"""Fire concurrent registrations at a running server and check for duplicates or overbooking.
+
+Usage (with the app running locally against the same DATABASE_URL):
+    python load_test_registration.py --url http://127.0.0.1:5000 --students 200 --capacity 50
+"""
+import argparse
+import http.cookiejar
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from werkzeug.security import generate_password_hash
+from app import create_app
+from models import db, Event, Student, Registration, Category
+
+PASSWORD = "loadtest"
+
+
+def setup(app, students, capacity):
+    with app.app_context():
+        category = Category.query.first()
+        if not category:
+            category = Category(name="Load Test")
+            db.session.add(category)
+            db.session.flush()
+
+        stamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+        event = Event(title=f"Load test {stamp}", category_id=category.id, venue="Main Hall",
+                      date=datetime.utcnow() + timedelta(days=7), status="Approved", capacity=capacity)
+        db.session.add(event)
+
+        # Hash once; every load-test student shares the same password
+        password_hash = generate_password_hash(PASSWORD)
+        usernames = [f"lt_{stamp}_{i}" for i in range(students)]
+        db.session.execute(db.insert(Student), [
+            {"username": u, "email": f"{u}@example.com", "password_hash": password_hash} for u in usernames
+        ])
+        db.session.commit()
+        return event.id, usernames
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+def post(opener, url, data):
+    # Redirects surface as HTTPError with NoRedirect; only the status matters here
+    try:
+        return opener.open(url, data=data).status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def student_session(base_url, username):
+    jar = http.cookiejar.CookieJar()
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar), NoRedirect())
+    data = urllib.parse.urlencode({"username": username, "password": PASSWORD}).encode()
+    post(opener, f"{base_url}/student/login", data)
+    return opener
+
+
+def post_registration(opener, base_url, event_id):
+    start = time.perf_counter()
+    status = post(opener, f"{base_url}/student/register_event/{event_id}", b"")
+    return status, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--capacity", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=2, help="registration attempts per student")
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    app = create_app(register_views=False)
+    event_id, usernames = setup(app, args.students, args.capacity)
+    print(f"Event {event_id}: {args.students} students, capacity {args.capacity}")
+
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        openers = list(pool.map(lambda u: student_session(args.url, u), usernames))
+        attempts = [o for o in openers for _ in range(args.repeat)]
+        start = time.perf_counter()
+        results = list(pool.map(lambda o: post_registration(o, args.url, event_id), attempts))
+        elapsed = time.perf_counter() - start
+
+    statuses = {}
+    for status, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    latencies = sorted(t for _, t in results)
+    print(f"{len(results)} requests in {elapsed:.2f}s ({len(results) / elapsed:.0f} req/s), statuses {statuses}")
+    print(f"p50 {latencies[len(latencies) // 2] * 1000:.0f}ms, max {latencies[-1] * 1000:.0f}ms")
+
+    with app.app_context():
+        event = db.session.get(Event, event_id)
+        total = Registration.query.filter_by(event_id=event_id).count()
+        duplicates = (db.session.query(Registration.student_id)
+                      .filter_by(event_id=event_id)
+                      .group_by(Registration.student_id)
+                      .having(func.count() > 1)
+                      .count())
+
+    print(f"registrations {total}, counter {event.registered_count}, duplicates {duplicates}")
+    ok = duplicates == 0 and total <= args.capacity and total == event.registered_count
+    print("PASS" if ok else "FAIL")
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, insert, select, text
+from app import create_app
+from models import db
+from search import ensure_search_index
+
+# Names of the run_once steps already applied to this database
+schema_migrations = Table(
+    'schema_migrations', MetaData(),
+    Column('name', String(100), primary_key=True),
+    Column('applied_at', DateTime, nullable=False),
+)
+
+
+def run_once(step):
+    """Mark a migration step as a one-off: recorded in schema_migrations and skipped afterwards.
+
+    For full-table data fixes that would otherwise scan the largest tables on
+    every deploy.
+    """
+    step.run_once = True
+    return step
+
+
+def create_missing_tables(conn):
+    # New databases get the whole schema here; existing tables are left alone
+    db.metadata.create_all(conn, checkfirst=True)
+
+
+@run_once
+def dedupe_registrations(conn):
+    # Keep the earliest registration per (student, event) so the unique index can be built.
+    # The derived table lets MySQL delete from the table it is selecting from.
+    result = conn.execute(text(
+        "DELETE FROM registrations WHERE id NOT IN ("
+        "SELECT id FROM (SELECT MIN(id) AS id FROM registrations GROUP BY student_id, event_id) AS keep)"
+    ))
+    if result.rowcount:
+        print(f"Removed {result.rowcount} duplicate registrations.")
+
+
+def add_missing_columns(conn):
+    # Columns added to a model after its table was created. New NOT NULL
+    # columns need a server_default so existing rows can be filled in.
+    inspector = inspect(conn)
+    preparer = conn.dialect.identifier_preparer
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {c['name'] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            ddl = f"ALTER TABLE {preparer.quote(table.name)} ADD COLUMN {preparer.quote(column.name)} {column.type.compile(dialect=conn.dialect)}"
+            if column.server_default is not None:
+                ddl += f" DEFAULT '{column.server_default.arg}'"
+            if not column.nullable:
+                ddl += " NOT NULL"
+            conn.execute(text(ddl))
+            print(f"Added column {column.name} to {table.name}.")
+
+
+@run_once
+def backfill_registered_counts(conn):
+    conn.execute(text(
+        "UPDATE events SET registered_count = "
+        "(SELECT COUNT(*) FROM registrations"
+        " WHERE registrations.event_id = events.id AND registrations.status != 'Rejected')"
+    ))
+
+
+@run_once
+def backfill_updated_at(conn):
+    # Rows created before updated_at existed start from their creation time
+    for table in ('events', 'registrations'):
+        conn.execute(text(
+            f"UPDATE {table} SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP) WHERE updated_at IS NULL"
+        ))
+
+
+def create_missing_indexes(conn):
+    inspector = inspect(conn)
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {ix['name'] for ix in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(conn)
+                print(f"Created index {index.name} on {table.name}.")
+
+
+# Applied in order on every deploy (also via `flask init-db`); each step must be
+# idempotent, and the @run_once ones only run the first time.
+MIGRATIONS = [
+    create_missing_tables,
+    add_missing_columns,
+    dedupe_registrations,
+    create_missing_indexes,
+    backfill_registered_counts,
+    backfill_updated_at,
+    ensure_search_index,
+]
+
+
+def apply_migrations(conn):
+    schema_migrations.create(conn, checkfirst=True)
+    applied = {name for (name,) in conn.execute(select(schema_migrations.c.name))}
+    for step in MIGRATIONS:
+        if not getattr(step, 'run_once', False):
+            step(conn)
+        elif step.__name__ not in applied:
+            step(conn)
+            conn.execute(insert(schema_migrations).values(name=step.__name__, applied_at=datetime.utcnow()))
+
+
+def run_migrations():
+    app = create_app(register_views=False)
+    with app.app_context():
+        with db.engine.begin() as conn:
+            apply_migrations(conn)
+    print("Database migrated successfully.")
+
+
+if __name__ == "__main__":
+    run_migrations()
@@ -1,18 +1,25 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.dialects import mysql
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
+from auth import hash_password
+from replicas import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+
+# Microsecond precision on MySQL too, so ETags built from updated_at change on every write
+PreciseDateTime = db.DateTime().with_variant(mysql.DATETIME(fsp=6), 'mysql')
 
 class Admin(db.Model):
     __tablename__ = 'admins'
+    ROLE = 'admin'
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(self.ROLE, password)
 
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
@@ -22,6 +29,7 @@ class Admin(db.Model):
 
 class Coordinator(db.Model):
     __tablename__ = 'coordinators'
+    ROLE = 'coordinator'
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
@@ -31,7 +39,7 @@ class Coordinator(db.Model):
     events = db.relationship('Event', backref='coordinator', lazy=True)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(self.ROLE, password)
 
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
@@ -41,6 +49,7 @@ class Coordinator(db.Model):
 
 class Student(db.Model):
     __tablename__ = 'students'
+    ROLE = 'student'
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(120), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
@@ -51,7 +60,7 @@ class Student(db.Model):
     notifications = db.relationship('Notification', backref='student', lazy=True, cascade="all, delete-orphan")
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(self.ROLE, password)
 
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
@@ -65,6 +74,11 @@ class Category(db.Model):
 
 class Event(db.Model):
     __tablename__ = 'events'
+    __table_args__ = (
+        # Index and archive pages: one status, keyset-ordered by (date, id). Both
+        # SQLite and InnoDB keep the primary key in every index, so id is implied.
+        db.Index('ix_events_status_date', 'status', 'date'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(120), nullable=False)
     
@@ -82,27 +96,59 @@ class Event(db.Model):
     announcements = db.Column(db.Text, nullable=True)
     results = db.Column(db.Text, nullable=True)
     image_file = db.Column(db.String(120), nullable=True, default='default.jpg')
+
+    capacity = db.Column(db.Integer, nullable=True) # None means unlimited
+    registered_count = db.Column(db.Integer, nullable=False, default=0, server_default='0') # Non-rejected registrations; kept in step by registrations.py
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(PreciseDateTime, default=datetime.utcnow, onupdate=datetime.utcnow) # Also bumped by Core UPDATEs
 
     def __repr__(self):
         return f"<Event {self.id} {self.title}>"
 
 class Registration(db.Model):
     __tablename__ = 'registrations'
+    __table_args__ = (
+        # One registration per student per event; also serves lookups by student_id
+        db.Index('uq_registrations_student_event', 'student_id', 'event_id', unique=True),
+        db.Index('ix_registrations_event_status', 'event_id', 'status'),
+        db.Index('ix_registrations_status_created', 'status', 'created_at'),
+        db.Index('ix_registrations_created_id', 'created_at', 'id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
     event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False)
     status = db.Column(db.String(50), default='Pending')  # Pending, Approved, Rejected
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     approved_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(PreciseDateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     event = db.relationship('Event', backref=db.backref('registrations', cascade='all, delete-orphan'))
 
 class Notification(db.Model):
     __tablename__ = 'notifications'
+    __table_args__ = (
+        db.Index('ix_notifications_student_read_created', 'student_id', 'is_read', 'created_at'),
+        # Listings of all of a student's notifications, newest first, keyset-paged by (created_at, id)
+        db.Index('ix_notifications_student_created_id', 'student_id', 'created_at', 'id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
     message = db.Column(db.String(500), nullable=False)
     is_read = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class NotificationJob(db.Model):
+    # Queued fan-out of one message to every registrant of an event
+    __tablename__ = 'notification_jobs'
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.Integer, db.ForeignKey('events.id', ondelete='CASCADE'), nullable=False)
+    message = db.Column(db.String(500), nullable=False)
+    dedupe_key = db.Column(db.String(64), unique=True, nullable=False) # Same change queued twice is one job
+    status = db.Column(db.String(20), nullable=False, default='pending', index=True) # pending, running, done, failed
+    last_student_id = db.Column(db.Integer, nullable=False, default=0) # Fan-out progress, for resuming retries
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text, nullable=True)
+    claimed_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
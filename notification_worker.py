@@ -0,0 +1,18 @@
+"""Drain the notification job queue in a separate process.
+
+Run alongside the web workers with NOTIFICATION_WORKER=off to keep fan-out
+entirely out of the gunicorn processes.
+"""
+import time
+from app import create_app
+from notifications import run_pending, POLL_INTERVAL
+
+app = create_app(register_views=False)
+
+if __name__ == "__main__":
+    with app.app_context():
+        while True:
+            processed = run_pending(app.config['NOTIFICATION_BATCH_SIZE'])
+            if processed:
+                print(f"Processed {processed} notification job(s).")
+            time.sleep(POLL_INTERVAL if not processed else 0)
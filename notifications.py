@@ -0,0 +1,208 @@
+import hashlib
+import logging
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import update, func, or_, and_
+from sqlalchemy.exc import IntegrityError
+from models import db, Registration, Notification, NotificationJob
+from cache import MemoryBackend
+
+log = logging.getLogger(__name__)
+
+FANOUT_BATCH_SIZE = 1000
+MAX_ATTEMPTS = 5
+STALE_CLAIM = timedelta(minutes=10)  # A running job older than this is assumed dead
+POLL_INTERVAL = 30
+UNREAD_COUNT_TTL = 60  # Bounds staleness from inserts made by other processes
+UNREAD_COUNT_MAXSIZE = 10_000
+
+
+class UnreadCounter:
+    """Per-student unread notification counts, cached in process.
+
+    Entries are dropped whenever this process inserts a student's
+    notifications and zeroed when it marks them read; the TTL covers inserts
+    made by other processes. Only a badge: anything that acts on unread rows
+    must query them. Held in an LRU of `maxsize` students.
+    """
+
+    def __init__(self, ttl=UNREAD_COUNT_TTL, maxsize=UNREAD_COUNT_MAXSIZE):
+        self.ttl = ttl
+        self._counts = MemoryBackend(maxsize)
+
+    def get(self, student_id):
+        entry = self._counts.get(student_id)
+        if entry is not None:
+            return entry[0]
+        count = db.session.query(func.count(Notification.id)).filter(
+            Notification.student_id == student_id, Notification.is_read.is_(False)).scalar()
+        self.set(student_id, count)
+        return count
+
+    def set(self, student_id, count):
+        self._counts.set(student_id, count, self.ttl)
+
+    def invalidate(self, *student_ids):
+        for student_id in student_ids:
+            self._counts.delete(student_id)
+
+    def clear(self):
+        self._counts.clear()
+
+
+unread_counter = UnreadCounter()
+
+
+def mark_all_read(student_id):
+    """Mark every unread notification of a student read with one UPDATE."""
+    db.session.execute(
+        update(Notification)
+        .where(Notification.student_id == student_id, Notification.is_read.is_(False))
+        .values(is_read=True)
+    )
+    db.session.commit()
+    # Known to be zero now; saves the badge on the same page a COUNT
+    unread_counter.set(student_id, 0)
+
+
+def event_update_message(event, field, text):
+    label = {'announcements': 'New announcement', 'results': 'Results are out'}[field]
+    return f"{label} for {event.title}: {text}"[:500]
+
+
+def enqueue_fanout(event_id, message, version=''):
+    """Queue `message` for every registrant of an event. Returns the job, or None if already queued.
+
+    `version` identifies the change being announced (the event's updated_at):
+    the same change queued twice is one job, while the same text set again
+    by a later edit is a new one.
+    """
+    key = hashlib.sha256(f"{event_id}:{version}:{message}".encode()).hexdigest()
+    job = NotificationJob(event_id=event_id, message=message, dedupe_key=key)
+    db.session.add(job)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return None
+    return job
+
+
+def _claim(job_id):
+    # Conditional UPDATE so only one worker (thread or process) wins each job
+    now = datetime.utcnow()
+    claimed = db.session.execute(
+        update(NotificationJob)
+        .where(NotificationJob.id == job_id,
+               or_(NotificationJob.status == 'pending',
+                   and_(NotificationJob.status == 'running', NotificationJob.claimed_at < now - STALE_CLAIM)))
+        .values(status='running', claimed_at=now, attempts=NotificationJob.attempts + 1)
+    ).rowcount
+    db.session.commit()
+    return bool(claimed)
+
+
+def _fanout(job, batch_size):
+    while True:
+        student_ids = [sid for (sid,) in db.session.query(Registration.student_id)
+                       .filter(Registration.event_id == job.event_id,
+                               Registration.student_id > job.last_student_id)
+                       .order_by(Registration.student_id)
+                       .limit(batch_size)]
+        if not student_ids:
+            return
+        now = datetime.utcnow()
+        db.session.bulk_insert_mappings(Notification, [
+            {'student_id': sid, 'message': job.message, 'is_read': False, 'created_at': now}
+            for sid in student_ids
+        ])
+        # Progress is committed with the batch, so a retry resumes after it
+        job.last_student_id = student_ids[-1]
+        db.session.commit()
+        unread_counter.invalidate(*student_ids)
+
+
+def run_job(job_id, batch_size=FANOUT_BATCH_SIZE):
+    """Claim and run one job. Safe to call concurrently and to retry."""
+    if not _claim(job_id):
+        return False
+    job = db.session.get(NotificationJob, job_id)
+    try:
+        _fanout(job, batch_size)
+        job.status = 'done'
+        job.finished_at = datetime.utcnow()
+        job.error = None
+    except Exception as e:
+        db.session.rollback()
+        log.exception("Notification job %s failed", job_id)
+        job = db.session.get(NotificationJob, job_id)
+        job.status = 'failed' if job.attempts >= MAX_ATTEMPTS else 'pending'
+        job.error = str(e)
+    db.session.commit()
+    return True
+
+
+def run_pending(batch_size=FANOUT_BATCH_SIZE):
+    """Run every runnable job. Returns how many were processed."""
+    now = datetime.utcnow()
+    job_ids = [jid for (jid,) in db.session.query(NotificationJob.id)
+               .filter(or_(NotificationJob.status == 'pending',
+                           and_(NotificationJob.status == 'running', NotificationJob.claimed_at < now - STALE_CLAIM)))
+               .order_by(NotificationJob.id)]
+    db.session.commit()
+    return sum(run_job(jid, batch_size) for jid in job_ids)
+
+
+class NotificationDispatcher:
+    """Runs queued fan-out jobs off the request path.
+
+    The job table is the queue, so no broker is needed: jobs survive restarts
+    and any number of app processes (or notification_worker.py) can drain it.
+    NOTIFICATION_WORKER selects the mode: 'thread' (default) starts a daemon
+    thread on first use, 'sync' runs jobs inline (handy for tests), and 'off'
+    leaves them for an external worker.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._wake = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('NOTIFICATION_WORKER', 'thread')
+        app.config.setdefault('NOTIFICATION_BATCH_SIZE', FANOUT_BATCH_SIZE)
+        app.extensions['notification_dispatcher'] = self
+        self.app = app
+
+    def dispatch(self, event_id, message, version=''):
+        job = enqueue_fanout(event_id, message, version)
+        if job is None:
+            return
+        mode = self.app.config['NOTIFICATION_WORKER']
+        if mode == 'sync':
+            run_job(job.id, self.app.config['NOTIFICATION_BATCH_SIZE'])
+        elif mode == 'thread':
+            self._ensure_thread()
+            self._wake.set()
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name='notification-dispatcher', daemon=True)
+                self._thread.start()
+
+    def _loop(self):
+        while True:
+            self._wake.wait(POLL_INTERVAL)
+            self._wake.clear()
+            try:
+                with self.app.app_context():
+                    run_pending(self.app.config['NOTIFICATION_BATCH_SIZE'])
+            except Exception:
+                log.exception("Notification dispatcher loop failed")
+
+
+dispatcher = NotificationDispatcher()
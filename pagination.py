@@ -0,0 +1,108 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(values, direction):
+    """Pack a row's sort key into an opaque, URL-safe token."""
+    payload = {
+        'd': direction,
+        'k': [v.isoformat() if isinstance(v, datetime) else v for v in values],
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token, columns):
+    """Unpack a token produced by encode_cursor, or return None if it is invalid."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw)
+        direction = payload['d']
+        values = payload['k']
+        if direction not in ('next', 'prev') or len(values) != len(columns):
+            return None
+        key = []
+        for col, value in zip(columns, values):
+            expected = col.type.python_type
+            if expected is datetime:
+                value = datetime.fromisoformat(value)
+            elif isinstance(value, bool) or not isinstance(value, (int, float) if expected is float else expected):
+                # Lists, objects and the like would otherwise reach the query as parameters
+                return None
+            key.append(value)
+        return direction, key
+    except (ValueError, KeyError, TypeError, NotImplementedError):
+        return None
+
+
+def _after(columns, key, descending):
+    # Expanded (a > x) OR (a = x AND b > y) form, which both SQLite and MySQL
+    # can answer with a range scan on a composite index.
+    clauses = []
+    for i, col in enumerate(columns):
+        cmp = col < key[i] if descending else col > key[i]
+        clauses.append(and_(*[columns[j] == key[j] for j in range(i)], cmp))
+    return or_(*clauses)
+
+
+class KeysetPage:
+    """One page of keyset-paginated results with opaque next/prev tokens."""
+
+    def __init__(self, items, next_cursor, prev_cursor):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def keyset_paginate(query, columns, cursor=None, per_page=20, descending=False):
+    """Paginate `query` by the unique sort key `columns` without OFFSET or COUNT.
+
+    Every page, however deep, is a single index range scan of `per_page + 1`
+    rows. `cursor` is a token from a previous page's next/prev_cursor.
+    """
+    decoded = decode_cursor(cursor, columns)
+    direction, key = decoded if decoded else ('next', None)
+
+    # Walking backwards reads the index in reverse and flips the result
+    reverse = direction == 'prev'
+    scan_desc = descending != reverse
+
+    if key is not None:
+        query = query.filter(_after(columns, key, scan_desc))
+    order = [c.desc() if scan_desc else c.asc() for c in columns]
+    rows = query.order_by(*order).limit(per_page + 1).all()
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if reverse:
+        rows.reverse()
+
+    def key_of(row):
+        return [getattr(row, c.key) for c in columns]
+
+    if reverse:
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, key is not None
+
+    next_cursor = encode_cursor(key_of(rows[-1]), 'next') if rows and has_next else None
+    prev_cursor = encode_cursor(key_of(rows[0]), 'prev') if rows and has_prev else None
+    return KeysetPage(rows, next_cursor, prev_cursor)
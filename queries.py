@@ -0,0 +1,61 @@
+from sqlalchemy.orm import joinedload, contains_eager
+from models import db, Registration
+
+BATCH_SIZE = 1000
+
+# Registration pages always render the student and/or event of each row, so
+# load those relationships up front instead of lazily per row. These are
+# functions because the `student` backref only exists once mappers configure.
+def with_student():
+    return joinedload(Registration.student)
+
+
+def with_event():
+    return joinedload(Registration.event)
+
+
+def registrations_query():
+    """Registrations with both student and event eager-loaded."""
+    return Registration.query.options(with_student(), with_event())
+
+
+def registrations_for_student(student_id):
+    """A student's registrations with their events eager-loaded."""
+    return (Registration.query.options(with_event())
+            .filter(Registration.student_id == student_id)
+            .order_by(Registration.id))
+
+
+def registrations_for_event(event_id):
+    """An event's registrations with their students eager-loaded."""
+    return (Registration.query.options(with_student())
+            .filter(Registration.event_id == event_id)
+            .order_by(Registration.id))
+
+
+def registrations_joined_event():
+    """Registrations explicitly joined to their event, so callers can filter on
+    Event columns; the joined event populates `reg.event` without a second join."""
+    return (Registration.query.join(Registration.event)
+            .options(with_student(), contains_eager(Registration.event)))
+
+
+def iter_batched(query, id_column, batch_size=BATCH_SIZE):
+    """Yield the rows of `query` in `id_column` order, one bounded query per batch.
+
+    Each batch is keyed on the last id seen rather than an OFFSET, and is
+    expunged from the session once consumed, so memory stays flat however
+    many rows there are. Relationships the caller reads must be eager-loaded.
+    """
+    last_id = None
+    while True:
+        batch_query = query if last_id is None else query.filter(id_column > last_id)
+        batch = batch_query.order_by(id_column).limit(batch_size).all()
+        if not batch:
+            return
+        yield from batch
+        last_id = getattr(batch[-1], id_column.key)
+        # Drop the finished batch from the identity map so it can be freed
+        db.session.expunge_all()
+        if len(batch) < batch_size:
+            return
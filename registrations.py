@@ -0,0 +1,140 @@
+from datetime import datetime
+from sqlalchemy import update, insert, select, literal, or_, func
+from sqlalchemy.exc import IntegrityError
+from models import db, Event, Registration, Notification
+from notifications import unread_counter
+from certificates import certificates
+
+REGISTERED = 'registered'
+DUPLICATE = 'duplicate'
+FULL = 'full'
+
+
+def register_student(student_id, event_id):
+    """Atomically register a student for an event.
+
+    The seat is claimed with a conditional UPDATE on the event's counter, so
+    capacity is enforced by the database rather than a read-then-write, and
+    the registration insert relies on the unique (student_id, event_id) index
+    to reject duplicates. Both happen in one transaction: a duplicate rolls
+    back the claimed seat. Returns REGISTERED, DUPLICATE or FULL.
+    """
+    try:
+        claimed = db.session.execute(
+            update(Event)
+            .where(Event.id == event_id,
+                   or_(Event.capacity.is_(None), Event.registered_count < Event.capacity))
+            .values(registered_count=Event.registered_count + 1)
+        ).rowcount
+        if not claimed:
+            db.session.rollback()
+            return FULL
+
+        db.session.execute(insert(Registration).values(student_id=student_id, event_id=event_id))
+        db.session.commit()
+        return REGISTERED
+    except IntegrityError:
+        db.session.rollback()
+        return DUPLICATE
+
+
+def release_student_seats(student_id):
+    """Give back the seats held by a student's registrations (call before deleting them)."""
+    # Rejected registrations gave their seat back when they were rejected
+    event_ids = db.session.query(Registration.event_id).filter(Registration.student_id == student_id,
+                                                              Registration.status != 'Rejected')
+    db.session.execute(
+        update(Event)
+        .where(Event.id.in_(event_ids.scalar_subquery()))
+        .values(registered_count=Event.registered_count - 1)
+    )
+
+
+REGISTRATION_MESSAGES = {
+    'Approved': "Your registration for {title} has been approved.",
+    'Rejected': "Your registration for {title} has been rejected.",
+}
+EVENT_MESSAGES = {
+    'Approved': "{title} has been approved and is going ahead.",
+    'Rejected': "{title} has been cancelled.",
+    'Completed': "{title} is over. Approved participants can now download their certificates.",
+}
+
+
+def _message(template, title_column):
+    # Build the per-row message in SQL so notifications can be INSERT ... SELECTed
+    before, after = template.split('{title}')
+    return (literal(before) + title_column + literal(after)).label('message')
+
+
+def _notify_from_select(rows_select):
+    db.session.execute(
+        insert(Notification).from_select(['student_id', 'message', 'is_read', 'created_at'], rows_select)
+    )
+    # The recipients aren't known in Python here, so drop every cached count
+    unread_counter.clear()
+
+
+def set_registration_status(status, reg_ids=None, event_id=None):
+    """Approve or reject pending registrations in bulk.
+
+    Targets the given registration ids and/or every pending registration of
+    `event_id`. The affected students are notified with one INSERT ... SELECT
+    and the rows updated with one UPDATE, in the same transaction. Rejecting
+    gives the seats back: registered_count counts non-rejected registrations.
+    Returns the number of registrations changed.
+    """
+    if not reg_ids and event_id is None:
+        return 0
+
+    criteria = [Registration.status == 'Pending']
+    if reg_ids:
+        criteria.append(Registration.id.in_(reg_ids))
+    if event_id is not None:
+        criteria.append(Registration.event_id == event_id)
+
+    now = datetime.utcnow()
+    _notify_from_select(
+        select(Registration.student_id, _message(REGISTRATION_MESSAGES[status], Event.title),
+               literal(False), literal(now))
+        .join(Event, Event.id == Registration.event_id)
+        .where(*criteria)
+    )
+    if status == 'Rejected':
+        # Before the rows change status, while `criteria` still selects them
+        rejected = (select(func.count(Registration.id))
+                    .where(*criteria, Registration.event_id == Event.id)
+                    .correlate(Event).scalar_subquery())
+        db.session.execute(
+            update(Event)
+            .where(Event.id.in_(select(Registration.event_id).where(*criteria)))
+            .values(registered_count=Event.registered_count - rejected)
+        )
+    values = {'status': status}
+    if status == 'Approved':
+        values['approved_at'] = now
+    changed = db.session.execute(update(Registration).where(*criteria).values(**values)).rowcount
+    db.session.commit()
+    return changed
+
+
+def set_event_status(status, event_ids):
+    """Approve, reject or complete events in bulk and notify their registrants. Returns the number changed.
+
+    Completing an event queues its certificates for rendering.
+    """
+    if not event_ids:
+        return 0
+
+    criteria = [Event.id.in_(event_ids), Event.status != status]
+    completed = [eid for (eid,) in db.session.query(Event.id).filter(*criteria)] if status == 'Completed' else []
+    _notify_from_select(
+        select(Registration.student_id, _message(EVENT_MESSAGES[status], Event.title),
+               literal(False), literal(datetime.utcnow()))
+        .join(Event, Event.id == Registration.event_id)
+        .where(*criteria)
+    )
+    changed = db.session.execute(update(Event).where(*criteria).values(status=status)).rowcount
+    db.session.commit()
+    certificates.generate_events(completed)
+    return changed
@@ -0,0 +1,69 @@
+import random
+import time
+from contextlib import contextmanager
+from functools import wraps
+from flask import current_app, g, has_request_context, request, session
+from flask_sqlalchemy.session import Session
+
+REPLICA_PREFIX = 'replica_'
+# Flask session key holding the time until which this client reads from the primary
+PRIMARY_UNTIL = '_primary_until'
+
+
+def replica_bind_keys(config):
+    return [key for key in (config.get('SQLALCHEMY_BINDS') or {}) if key.startswith(REPLICA_PREFIX)]
+
+
+class RoutingSession(Session):
+    """Sends SELECTs from @use_replica views to a read replica; everything else to the primary.
+
+    Any write during a request pins the rest of that request to the primary,
+    and marks the client so its next requests within READ_AFTER_WRITE_SECONDS
+    read from the primary too (e.g. the page redirected to after a POST).
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_request_context():
+            if self._flushing or getattr(clause, 'is_dml', False):
+                g.db_wrote = True
+                g.db_replica = None
+            elif g.get('db_replica') and getattr(clause, 'is_select', False):
+                return self._db.engines[g.db_replica]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def use_replica(f):
+    """Let a GET view read from a replica, unless this client wrote recently."""
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        keys = current_app.extensions.get('replicas')
+        if keys and request.method in ('GET', 'HEAD') and session.get(PRIMARY_UNTIL, 0) < time.time():
+            # One replica per request so a page never mixes two replication positions
+            g.db_replica = random.choice(keys)
+        return f(*args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def primary():
+    """Read from the primary inside this block, e.g. while filling a shared cache entry."""
+    if not has_request_context():
+        yield
+        return
+    replica = g.pop('db_replica', None)
+    try:
+        yield
+    finally:
+        if replica and not g.get('db_wrote'):
+            g.db_replica = replica
+
+
+def init_replicas(app):
+    app.config.setdefault('READ_AFTER_WRITE_SECONDS', 5)
+    app.extensions['replicas'] = replica_bind_keys(app.config)
+
+    @app.after_request
+    def remember_write(response):
+        if g.get('db_wrote') and app.extensions['replicas']:
+            session[PRIMARY_UNTIL] = time.time() + app.config['READ_AFTER_WRITE_SECONDS']
+        return response
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func, case
+from models import db, Event, Registration, Category, Student
+
+REGISTRATION_STATUSES = ('Pending', 'Approved', 'Rejected')
+EVENT_STATUSES = ('Proposed', 'Approved', 'Rejected', 'Completed')
+
+
+def _status_count(status):
+    # Conditional aggregate so every status is counted in the same pass
+    return func.coalesce(func.sum(case((Registration.status == status, 1), else_=0)), 0).label(status.lower())
+
+
+def parse_report_filters(args):
+    """Read date range and event status filters from request args."""
+    filters = {'start': None, 'end': None, 'status': None}
+    for key in ('start', 'end'):
+        value = (args.get(key) or '').strip()
+        if value:
+            try:
+                filters[key] = datetime.strptime(value, '%Y-%m-%d')
+            except ValueError:
+                pass
+    status = (args.get('status') or '').strip()
+    if status in EVENT_STATUSES:
+        filters['status'] = status
+    return filters
+
+
+def _apply_filters(query, start=None, end=None, status=None):
+    if start:
+        query = query.filter(Event.date >= start)
+    if end:
+        # End date is inclusive
+        query = query.filter(Event.date < end + timedelta(days=1))
+    if status:
+        query = query.filter(Event.status == status)
+    return query
+
+
+def event_registration_stats(start=None, end=None, status=None, page=1, per_page=50):
+    """Per-event registration counts broken down by status, in one grouped query."""
+    query = (
+        db.session.query(
+            Event.id,
+            Event.title,
+            Event.date,
+            Event.status,
+            Category.name.label('category'),
+            func.count(Registration.id).label('registrations'),
+            *[_status_count(s) for s in REGISTRATION_STATUSES],
+        )
+        .outerjoin(Category, Category.id == Event.category_id)
+        .outerjoin(Registration, Registration.event_id == Event.id)
+    )
+    query = _apply_filters(query, start, end, status)
+    query = query.group_by(Event.id, Event.title, Event.date, Event.status, Category.name)
+    query = query.order_by(Event.date.desc(), Event.id.desc())
+    return query.paginate(page=page, per_page=per_page, error_out=False)
+
+
+def category_registration_stats(start=None, end=None, status=None):
+    """Registration counts per category broken down by status."""
+    query = (
+        db.session.query(
+            Category.name.label('category'),
+            func.count(func.distinct(Event.id)).label('events'),
+            func.count(Registration.id).label('registrations'),
+            *[_status_count(s) for s in REGISTRATION_STATUSES],
+        )
+        .join(Event, Event.category_id == Category.id)
+        .outerjoin(Registration, Registration.event_id == Event.id)
+    )
+    query = _apply_filters(query, start, end, status)
+    return query.group_by(Category.name).order_by(Category.name).all()
+
+
+def report_totals():
+    """Headline counts for the reports page."""
+    return {
+        'total_students': db.session.query(func.count(Student.id)).scalar(),
+        'total_events': db.session.query(func.count(Event.id)).scalar(),
+        'total_registrations': db.session.query(func.count(Registration.id)).scalar(),
+    }
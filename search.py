@@ -0,0 +1,206 @@
+import logging
+import re
+from sqlalchemy import text, func, literal, or_
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from models import db, Event, Category
+from events import visibility_filter
+
+log = logging.getLogger(__name__)
+
+SEARCH_PER_PAGE = 20
+MAX_SEARCH_PAGE = 50  # Ranked results use OFFSET, so keep it shallow
+
+# Column weights for bm25(): title, description, venue, category
+SQLITE_WEIGHTS = (10.0, 1.0, 3.0, 5.0)
+
+# dialect -> (search table, its event id column). Both hold the same four
+# columns, category name included, kept in step by index_event/remove_event.
+SEARCH_TABLES = {
+    'sqlite': ('events_fts', 'rowid'),
+    'mysql': ('events_search', 'id'),
+}
+
+
+def _dialect():
+    return db.engine.dialect.name
+
+
+def _terms(q):
+    return re.findall(r"\w+", q or "", re.UNICODE)[:10]
+
+
+def _sqlite_match(terms):
+    # Quote every term so user input can't inject FTS5 syntax; prefix-match each
+    return " ".join('"{}"*'.format(t.replace('"', '')) for t in terms)
+
+
+def _mysql_match(terms):
+    return " ".join(f"+{t}*" for t in terms)
+
+
+# ================
+# Index maintenance
+# ================
+
+def ensure_search_index(conn):
+    """Create the full-text index for the current database if it is missing."""
+    if conn.dialect.name == 'sqlite':
+        exists = conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'events_fts'")).first()
+        if not exists:
+            conn.execute(text(
+                "CREATE VIRTUAL TABLE events_fts USING fts5("
+                "title, description, venue, category, tokenize = 'unicode61 remove_diacritics 2')"
+            ))
+            rebuild_search_index(conn)
+            print("Created full-text index events_fts.")
+    elif conn.dialect.name == 'mysql':
+        exists = conn.execute(text(
+            "SELECT 1 FROM information_schema.tables WHERE table_schema = DATABASE() "
+            "AND table_name = 'events_search'"
+        )).first()
+        if not exists:
+            # A FULLTEXT index can't span tables, so the category name is copied in as on SQLite
+            conn.execute(text(
+                "CREATE TABLE events_search ("
+                "id INT NOT NULL PRIMARY KEY, title VARCHAR(120) NOT NULL, description TEXT, "
+                "venue VARCHAR(200), category VARCHAR(100), "
+                "FULLTEXT INDEX ft_events_search (title, description, venue, category)) ENGINE=InnoDB"
+            ))
+            rebuild_search_index(conn)
+            print("Created full-text index events_search.")
+        # Superseded by events_search; dropping it saves index work on every event write
+        old = conn.execute(text(
+            "SELECT 1 FROM information_schema.statistics WHERE table_schema = DATABASE() "
+            "AND table_name = 'events' AND index_name = 'ft_events'"
+        )).first()
+        if old:
+            conn.execute(text("ALTER TABLE events DROP INDEX ft_events"))
+            print("Dropped full-text index ft_events.")
+
+
+def rebuild_search_index(conn):
+    if conn.dialect.name not in SEARCH_TABLES:
+        return
+    table, id_column = SEARCH_TABLES[conn.dialect.name]
+    conn.execute(text(f"DELETE FROM {table}"))
+    conn.execute(text(
+        f"INSERT INTO {table} ({id_column}, title, description, venue, category) "
+        "SELECT events.id, events.title, COALESCE(events.description, ''), events.venue, COALESCE(categories.name, '') "
+        "FROM events LEFT JOIN categories ON categories.id = events.category_id"
+    ))
+
+
+def index_event(event):
+    """Add or refresh an event in the search index, inside the caller's transaction."""
+    if _dialect() not in SEARCH_TABLES:
+        return
+    table, id_column = SEARCH_TABLES[_dialect()]
+    db.session.flush()
+    category = db.session.get(Category, event.category_id) if event.category_id else None
+    db.session.execute(text(f"DELETE FROM {table} WHERE {id_column} = :id"), {"id": event.id})
+    db.session.execute(
+        text(f"INSERT INTO {table} ({id_column}, title, description, venue, category) "
+             "VALUES (:id, :title, :description, :venue, :category)"),
+        {"id": event.id, "title": event.title, "description": event.description or "",
+         "venue": event.venue or "", "category": category.name if category else ""},
+    )
+
+
+def remove_event(event_id):
+    if _dialect() not in SEARCH_TABLES:
+        return
+    table, id_column = SEARCH_TABLES[_dialect()]
+    db.session.execute(text(f"DELETE FROM {table} WHERE {id_column} = :id"), {"id": event_id})
+
+
+# ================
+# Querying
+# ================
+
+class SearchResults:
+    def __init__(self, events, total, facets, page, per_page):
+        self.items = events
+        self.total = total
+        self.facets = facets
+        self.page = page
+        self.per_page = per_page
+
+    @property
+    def has_prev(self):
+        return self.page > 1
+
+    @property
+    def has_next(self):
+        return self.page * self.per_page < self.total and self.page < MAX_SEARCH_PAGE
+
+
+def _ranked_ids(terms):
+    """(id, score) for events matching every term, best first, as a subquery."""
+    dialect = _dialect()
+    if dialect == 'sqlite':
+        weights = ", ".join(str(w) for w in SQLITE_WEIGHTS)
+        return text(
+            f"SELECT rowid AS id, bm25(events_fts, {weights}) AS score FROM events_fts WHERE events_fts MATCH :match"
+        ).bindparams(match=_sqlite_match(terms)).columns(id=db.Integer, score=db.Float).subquery('matches')
+    if dialect == 'mysql':
+        # Negate the relevance score so that lower is better, as with bm25()
+        return text(
+            "SELECT id, -MATCH(title, description, venue, category) AGAINST (:match IN BOOLEAN MODE) AS score "
+            "FROM events_search WHERE MATCH(title, description, venue, category) AGAINST (:match IN BOOLEAN MODE)"
+        ).bindparams(match=_mysql_match(terms)).columns(id=db.Integer, score=db.Float).subquery('matches')
+    return None
+
+
+def _like_query(terms):
+    # Unindexed fallback for other databases or a missing index
+    query = (db.session.query(Event.id.label('id'), literal(0.0).label('score'))
+             .outerjoin(Category, Category.id == Event.category_id))
+    for t in terms:
+        pattern = f"%{t}%"
+        query = query.filter(or_(Event.title.ilike(pattern), Event.description.ilike(pattern),
+                                 Event.venue.ilike(pattern), Category.name.ilike(pattern)))
+    return query.subquery('matches')
+
+
+def search_events(q, category_id=None, start=None, end=None, page=1, per_page=SEARCH_PER_PAGE, viewer=None):
+    """Full-text search over events with category and date facets, ranked by relevance.
+
+    Only events `viewer` (current_identity()) may see are matched; see
+    events.visibility_filter.
+    """
+    terms = _terms(q)
+    page = max(1, min(page, MAX_SEARCH_PAGE))
+    if not terms:
+        return SearchResults([], 0, [], page, per_page)
+    try:
+        return _search(_ranked_ids(terms) if _dialect() in ('sqlite', 'mysql') else _like_query(terms),
+                       category_id, start, end, page, per_page, viewer)
+    except (OperationalError, ProgrammingError):
+        db.session.rollback()
+        log.warning("Full-text index unavailable, falling back to LIKE search; run migrate_db.py")
+        return _search(_like_query(terms), category_id, start, end, page, per_page, viewer)
+
+
+def _search(matches, category_id, start, end, page, per_page, viewer=None):
+    base = db.session.query(Event).join(matches, matches.c.id == Event.id)
+    visible = visibility_filter(viewer)
+    if visible is not None:
+        base = base.filter(visible)
+    if start:
+        base = base.filter(Event.date >= start)
+    if end:
+        base = base.filter(Event.date < end)
+
+    # Facet counts ignore the category filter so every category stays selectable
+    facets = (base.with_entities(Category.id, Category.name, func.count(Event.id))
+              .join(Category, Category.id == Event.category_id)
+              .group_by(Category.id, Category.name)
+              .order_by(func.count(Event.id).desc())
+              .all())
+
+    if category_id:
+        base = base.filter(Event.category_id == category_id)
+    total = base.count()
+    events = (base.order_by(matches.c.score, Event.date.desc())
+              .limit(per_page).offset((page - 1) * per_page).all())
+    return SearchResults(events, total, facets, page, per_page)
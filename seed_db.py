@@ -1,11 +1,13 @@
 from app import create_app, db
 from models import Category
+from migrate_db import apply_migrations
 
-app = create_app()
+app = create_app(register_views=False)
 
 with app.app_context():
     # Create tables if they don't exist (this will create Category and others in MySQL)
-    db.create_all()
+    with db.engine.begin() as conn:
+        apply_migrations(conn)
     
     # Seed Categories
     categories = ['Academic', 'Sports', 'Culture', 'Workshop', 'Seminar', 'Hostel']
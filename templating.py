@@ -0,0 +1,68 @@
+import hashlib
+import os
+from jinja2 import FileSystemBytecodeCache, TemplateNotFound, nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+from cache import cache
+
+FRAGMENT_CACHE_TTL = 300
+
+
+class FragmentCacheExtension(Extension):
+    """`{% cache "event-card", event.id, event.updated_at %}...{% endcache %}`
+
+    Stores the rendered block in the app cache under its key parts, so pass
+    the model's id and version (updated_at) and anything else the block
+    shows. The key also carries the template's source hash, so editing the
+    template retires its fragments. Keep per-viewer output (the logged-in
+    user, CSRF tokens, admin-only controls) outside the block.
+
+    Fragments share the app cache with pages and identities, so only use it
+    for small, hot sets such as the event cards; a block inside a loop over
+    an unbounded table would evict everything else and never be hit again.
+    """
+
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        parts = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            parts.append(parser.parse_expression())
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        # Resolved once at compile time; the bytecode cache keeps it with the compiled template
+        origin = nodes.Const(f"{parser.name}:{self._source_hash(parser.name)}")
+        call = self.call_method('_render', [origin, nodes.List(parts)])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _source_hash(self, name):
+        try:
+            source = self.environment.loader.get_source(self.environment, name)[0]
+        except (TemplateNotFound, TypeError, AttributeError):
+            return ''  # Templates built from strings have no source to hash
+        return hashlib.sha256(source.encode()).hexdigest()[:12]
+
+    def _render(self, origin, parts, caller):
+        ttl = self.environment.fragment_cache_ttl
+        if not ttl:
+            return caller()
+        key = cache.key('fragments', origin, *parts)
+        return Markup(cache.get_or_set(key, lambda: str(caller()), ttl))
+
+
+def init_templating(app):
+    """Persistent bytecode cache for compiled templates, and the {% cache %} fragment tag.
+
+    JINJA_BYTECODE_CACHE_DIR (blank disables) survives restarts, so new
+    workers load compiled templates instead of parsing them again.
+    FRAGMENT_CACHE_TTL of 0 renders fragments every time.
+    """
+    app.config.setdefault('JINJA_BYTECODE_CACHE_DIR', os.path.join(app.instance_path, 'jinja_cache'))
+    app.config.setdefault('FRAGMENT_CACHE_TTL', FRAGMENT_CACHE_TTL)
+
+    directory = app.config['JINJA_BYTECODE_CACHE_DIR']
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory)
+    app.jinja_env.add_extension(FragmentCacheExtension)
+    app.jinja_env.extend(fragment_cache_ttl=app.config['FRAGMENT_CACHE_TTL'])
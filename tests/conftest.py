@@ -0,0 +1,40 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    # Environment first: create_app reads it, and load_dotenv never overrides it
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setenv('DATABASE_REPLICA_URLS', '')
+    monkeypatch.setenv('NOTIFICATION_WORKER', 'sync')
+    monkeypatch.setenv('CERTIFICATE_WORKER', 'off')
+    monkeypatch.setenv('EVENT_SCHEDULER', 'off')
+    monkeypatch.setenv('CACHE_BACKEND', 'memory')
+    monkeypatch.setenv('JINJA_BYTECODE_CACHE_DIR', '')
+    monkeypatch.setenv('AUTH_HASH_WORKERS', '0')
+    monkeypatch.setenv('INSTRUMENTATION', '0')
+    for role in ('ADMIN', 'COORDINATOR', 'STUDENT'):
+        monkeypatch.setenv(f'PASSWORD_HASH_{role}', 'pbkdf2:sha256:1000')
+
+    from app import create_app
+    from cache import cache
+    from notifications import unread_counter
+
+    app = create_app()
+    app.config['TESTING'] = True
+    result = app.test_cli_runner().invoke(args=['init-db'])
+    assert result.exit_code == 0, result.output
+    yield app
+    cache.backend.clear()
+    unread_counter.clear()
+
+
+def login(client, role, username, password='pw'):
+    response = client.post(f'/{role}/login', data={'username': username, 'password': password})
+    assert response.status_code == 302, response.status_code
+    return client
@@ -0,0 +1,80 @@
+"""Pages that list registrations must not issue a query per row.
+
+Each page is rendered with N rows and again with 10 x N; the number of SQL
+statements has to stay the same.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event as sa_event
+
+from conftest import login
+
+N = 5
+
+
+def seed(app, count):
+    """Add `count` students registered for event 1 and `count` events student 1 registered for."""
+    from auth import hash_password
+    from models import db, Admin, Category, Coordinator, Event, Registration, Student
+
+    with app.app_context():
+        if not db.session.get(Admin, 1):
+            db.session.add(Admin(username='admin', password_hash=hash_password('admin', 'pw')))
+            db.session.add(Coordinator(username='coord', department='CS', password_hash=hash_password('coordinator', 'pw')))
+            db.session.add(Student(username='student', email='student@example.com', password_hash=hash_password('student', 'pw')))
+            db.session.add(Category(name='General'))
+            db.session.flush()
+            db.session.add(Event(title='Main', category_id=1, venue='Hall', date=datetime(2030, 1, 1),
+                                 status='Approved', coordinator_id=1))
+            db.session.flush()
+
+        offset = db.session.query(Student).count()
+        start = datetime(2030, 2, 1)
+        for i in range(offset, offset + count):
+            student = Student(username=f'student{i}', email=f'student{i}@example.com', password_hash='x')
+            event = Event(title=f'Event {i}', category_id=1, venue='Hall', date=start + timedelta(days=i),
+                          status='Approved', coordinator_id=1)
+            db.session.add_all([student, event])
+            db.session.flush()
+            db.session.add(Registration(student_id=student.id, event_id=1))
+            db.session.add(Registration(student_id=1, event_id=event.id))
+        db.session.commit()
+
+
+def count_statements(app, client, url):
+    from models import db
+
+    # Render once first so caches (identity, unread count, events) are equally warm
+    assert client.get(url).status_code == 200
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    sa_event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        response = client.get(url)
+        response.get_data()  # Streamed pages run their queries while the body is read
+    finally:
+        sa_event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+    assert response.status_code == 200
+    return len(statements)
+
+
+@pytest.mark.parametrize('role, username, url', [
+    ('admin', 'admin', '/admin/registrations'),
+    ('student', 'student', '/student/dashboard'),
+    ('coordinator', 'coord', '/coordinator/event/1/participants'),
+])
+def test_query_count_does_not_grow_with_rows(app, role, username, url):
+    seed(app, N)
+    client = login(app.test_client(), role, username)
+    small = count_statements(app, client, url)
+
+    seed(app, 9 * N)
+    large = count_statements(app, client, url)
+
+    assert large == small
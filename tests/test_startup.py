@@ -0,0 +1,22 @@
+"""Startup budget: create_app() stays fast and never touches the database.
+
+Each measurement runs in a fresh interpreter (see bench_startup.py), so
+import and first-request costs are cold, as in a new gunicorn worker.
+"""
+import statistics
+
+import bench_startup
+
+RUNS = 3
+
+
+def test_create_app_issues_no_sql_and_meets_budgets(tmp_path):
+    env = bench_startup.prepare_env(str(tmp_path))
+    runs = [bench_startup.run_child(env) for _ in range(RUNS)]
+
+    # Schema work belongs to `flask init-db`, not to every worker boot
+    assert max(r["startup_statements"] for r in runs) == 0
+
+    assert statistics.median(r["import"] for r in runs) <= bench_startup.IMPORT_BUDGET
+    assert statistics.median(r["create_app"] for r in runs) <= bench_startup.CREATE_APP_BUDGET
+    assert statistics.median(r["first_request"] for r in runs) <= bench_startup.FIRST_REQUEST_BUDGET
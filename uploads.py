@@ -0,0 +1,128 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.utils import secure_filename
+
+log = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+IMAGE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
+VARIANTS_DIR = 'variants'
+# Variant name -> bounding box; every variant is written as WebP
+VARIANT_SIZES = {
+    'thumb': (480, 320),
+    'medium': (1280, 960),
+}
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _pillow():
+    # Imported on first use so app startup doesn't pay for it. Pillow is
+    # optional; without it originals are served as-is.
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return None
+    return Image, ImageOps
+
+
+def _executor():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='thumbnails')
+        return _pool
+
+
+def _extension(filename):
+    name = secure_filename(filename or '')
+    return name.rsplit('.', 1)[1].lower() if '.' in name else ''
+
+
+def store_upload(file, folder):
+    """Save an uploaded file under the hash of its content and return the stored name.
+
+    The upload is streamed to a temp file in `folder` while it is hashed, so it
+    is never held in memory. Identical uploads map to the same name and are
+    stored once; image variants are generated in the background.
+    """
+    ext = _extension(file.filename)
+    digest = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix='.upload-')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = file.stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+
+        filename = digest.hexdigest()[:32] + (f'.{ext}' if ext else '')
+        path = os.path.join(folder, filename)
+        if os.path.exists(path):
+            # Already stored (and its variants scheduled) by an earlier upload
+            os.remove(tmp_path)
+            return filename
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    schedule_variants(folder, filename)
+    return filename
+
+
+def variant_name(filename, variant):
+    return f"{VARIANTS_DIR}/{filename.rsplit('.', 1)[0]}_{variant}.webp"
+
+
+def schedule_variants(folder, filename):
+    if _extension(filename) not in IMAGE_EXTENSIONS or _pillow() is None:
+        return None
+    return _executor().submit(generate_variants, folder, filename)
+
+
+def generate_variants(folder, filename):
+    """Write any missing resized WebP variants of an uploaded image."""
+    Image, ImageOps = _pillow()
+    os.makedirs(os.path.join(folder, VARIANTS_DIR), exist_ok=True)
+    source = os.path.join(folder, filename)
+    try:
+        with Image.open(source) as img:
+            img = ImageOps.exif_transpose(img)
+            if img.mode not in ('RGB', 'RGBA'):
+                img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+            for variant, box in VARIANT_SIZES.items():
+                target = os.path.join(folder, variant_name(filename, variant))
+                if os.path.exists(target):
+                    continue
+                resized = img.copy()
+                resized.thumbnail(box)
+                # Write then rename so readers never see a half-written file
+                fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target), prefix='.variant-')
+                with os.fdopen(fd, 'wb') as out:
+                    resized.save(out, 'WEBP', quality=80, method=4)
+                os.replace(tmp, target)
+    except Exception:
+        log.exception("Could not generate variants for %s", filename)
+
+
+def image_path_for(folder, filename, variant=None):
+    """Static path (relative to /static) of an uploaded image, preferring a ready variant.
+
+    Returns None for missing files and non-image uploads.
+    """
+    if not filename or _extension(filename) not in IMAGE_EXTENSIONS:
+        return None
+    if variant and os.path.exists(os.path.join(folder, variant_name(filename, variant))):
+        return f"uploads/{variant_name(filename, variant)}"
+    if os.path.exists(os.path.join(folder, filename)):
+        return f"uploads/{filename}"
+    return None
@@ -1,7 +1,7 @@
 from app import create_app
 from models import db, Event, Registration, Student, Admin
 
-app = create_app()
+app = create_app(register_views=False)
 
 with app.app_context():
     print("Checking database tables...")
@@ -0,0 +1,116 @@
+"""Route blueprints.
+
+Each module here is imported by register_blueprints() when the app is built,
+so scripts that only need the models and database (seed_db.py, migrate_db.py,
+notification_worker.py, ...) can skip loading the views altogether.
+"""
+from functools import wraps
+from importlib import import_module
+from flask import Response, current_app, flash, get_flashed_messages, redirect, stream_template, url_for
+from identity import current_identity
+
+# Blueprint modules in registration order; each defines a `bp`
+BLUEPRINTS = ("views.public", "views.admin", "views.coordinator", "views.student", "views.api")
+
+BULK_ACTIONS = {"approve": "Approved", "reject": "Rejected"}
+EVENT_BULK_ACTIONS = {**BULK_ACTIONS, "complete": "Completed"}
+STREAM_BUFFER_SIZE = 16 * 1024
+
+
+def register_blueprints(app):
+    for name in BLUEPRINTS:
+        app.register_blueprint(import_module(name).bp)
+
+
+# ===========================
+# Admin Login Required
+# ===========================
+def admin_login_required(f):
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        if not current_identity("admin"):
+            flash("Please log in as admin.", "error")
+            return redirect(url_for("admin.admin_login"))
+        return f(*args, **kwargs)
+    return wrapper
+
+# ===========================
+# Coordinator Login Required
+# ===========================
+def coordinator_login_required(f):
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        if not current_identity("coordinator"):
+            flash("Please log in as a coordinator.", "error")
+            return redirect(url_for("coordinator.coordinator_login"))
+        return f(*args, **kwargs)
+    return wrapper
+
+# ===========================
+# Student Login Required
+# ===========================
+def student_login_required(f):
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        if not current_identity("student"):
+            flash("Please log in as a student.", "error")
+            return redirect(url_for("student.student_login"))
+        return f(*args, **kwargs)
+    return wrapper
+
+
+# ===========================
+# Form helpers
+# ===========================
+def allowed_file(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in {'png', 'jpg', 'jpeg', 'gif', 'pdf', 'doc', 'docx'}
+
+
+def save_upload(file):
+    # Content-addressed storage; returns the stored name, or None if nothing usable was sent
+    from uploads import store_upload
+    if file and allowed_file(file.filename):
+        return store_upload(file, current_app.config['UPLOAD_FOLDER'])
+    return None
+
+
+def parse_capacity(value):
+    # Blank or invalid means unlimited
+    try:
+        capacity = int(value)
+    except (TypeError, ValueError):
+        return None
+    return capacity if capacity > 0 else None
+
+
+# ===========================
+# Streamed pages
+# ===========================
+def stream_page(template_name, **context):
+    """Like render_template, but sends the page while it renders.
+
+    The layout and table header go out before the first row is rendered, so
+    time-to-first-byte no longer grows with the table. Pass an iterator
+    (e.g. queries.iter_batched) to keep memory flat too; it is consumed
+    after the view returns, with the request context kept alive. Output is
+    sent in STREAM_BUFFER_SIZE chunks rather than one write per template
+    fragment.
+    """
+    # Pop flashed messages now: the session cookie is written before the body
+    get_flashed_messages()
+    return Response(_buffered(stream_template(template_name, **context)), mimetype="text/html")
+
+
+def _buffered(chunks, size=STREAM_BUFFER_SIZE):
+    buf, length = [], 0
+    try:
+        for chunk in chunks:
+            buf.append(chunk)
+            length += len(chunk)
+            if length >= size:
+                yield "".join(buf)
+                buf, length = [], 0
+        if buf:
+            yield "".join(buf)
+    finally:
+        chunks.close()
@@ -0,0 +1,354 @@
+from datetime import datetime, timedelta
+from flask import Blueprint, render_template, redirect, url_for, flash, request, session, jsonify
+from models import db, Event, Admin, Student, Registration, Coordinator, Category
+from queries import registrations_query, registrations_joined_event, iter_batched
+from exports import csv_response, registration_rows, REGISTRATION_HEADER
+from pagination import keyset_paginate
+from registrations import release_student_seats, set_registration_status, set_event_status
+from cache import cache
+from database import pool_stats
+from events import invalidate_events
+from certificates import certificates
+from search import index_event, remove_event
+from auth import authenticate, LoginThrottled, AuthBusy
+from reports import event_registration_stats, category_registration_stats, parse_report_filters, report_totals, EVENT_STATUSES
+from replicas import use_replica
+from identity import forget_identity
+from views import admin_login_required, save_upload, parse_capacity, stream_page, BULK_ACTIONS, EVENT_BULK_ACTIONS
+
+bp = Blueprint("admin", __name__)
+
+# ===========================
+# ADMIN AUTHINCATION
+# ===========================
+
+@bp.route("/admin/register", methods=["GET", "POST"])
+def admin_register():
+    if request.method == "POST":
+        username = request.form.get("username").strip()
+        password = request.form.get("password").strip()
+
+        if not username or not password:
+            flash("Username and password required.", "error")
+            return render_template("admin_register.html")
+
+        if Admin.query.filter_by(username=username).first():
+            flash("Username already taken.", "error")
+            return render_template("admin_register.html")
+
+        admin = Admin(username=username)
+        admin.set_password(password)
+
+        db.session.add(admin)
+        db.session.commit()
+
+        flash("Admin registered successfully.", "success")
+        return redirect(url_for("admin.admin_login"))
+
+    return render_template("admin_register.html")
+
+@bp.route("/admin/login", methods=["GET", "POST"])
+def admin_login():
+    if request.method == "POST":
+        username = request.form.get("username").strip()
+        password = request.form.get("password").strip()
+
+        try:
+            admin = authenticate(Admin, username, password)
+        except LoginThrottled:
+            flash("Too many login attempts. Please wait a few minutes and try again.", "error")
+            return render_template("admin_login.html"), 429
+        except AuthBusy:
+            flash("The server is busy. Please try again in a moment.", "error")
+            return render_template("admin_login.html"), 503
+
+        if not admin:
+            flash("Invalid username or password.", "error")
+            return render_template("admin_login.html")
+
+        session.clear()
+        session["admin_id"] = admin.id
+
+        flash("Logged in successfully.", "success")
+        return redirect(url_for("public.index"))
+
+    return render_template("admin_login.html")
+
+@bp.route("/admin/logout")
+def logout():
+    session.pop("admin_id", None)
+    flash("Logged out.", "info")
+    return redirect(url_for("public.index"))
+
+# ##########################################
+# Admin: View & Approve Registrations
+# ################################################
+
+@bp.route("/admin/registrations")
+@admin_login_required
+@use_replica
+def admin_view_registrations():
+    cursor = request.args.get("cursor")
+    registrations = keyset_paginate(registrations_query(), [Registration.created_at, Registration.id],
+                                    cursor=cursor, per_page=50, descending=True)
+    return stream_page("admin_registrations.html", registrations=registrations)
+
+@bp.route("/admin/registrations/export")
+@admin_login_required
+def admin_export_registrations():
+    # Export registrations for the selected events and/or an event date range
+    query = registrations_joined_event()
+    event_ids = request.args.getlist("event_id", type=int)
+    if event_ids:
+        query = query.filter(Registration.event_id.in_(event_ids))
+    filters = parse_report_filters(request.args)
+    if filters["start"]:
+        query = query.filter(Event.date >= filters["start"])
+    if filters["end"]:
+        query = query.filter(Event.date < filters["end"] + timedelta(days=1))
+
+    gzip = request.args.get("gzip") == "1"
+    return csv_response("registrations.csv", REGISTRATION_HEADER, registration_rows(query), gzip=gzip)
+
+@bp.route("/admin/registrations/approve/<int:reg_id>", methods=["POST"])
+@admin_login_required
+def approve_registration(reg_id):
+    reg_record = Registration.query.get_or_404(reg_id)
+    set_registration_status("Approved", reg_ids=[reg_record.id])
+
+    flash("Registration approved.", "success")
+    return redirect(url_for("admin.admin_view_registrations"))
+
+@bp.route("/admin/registrations/bulk", methods=["POST"])
+@admin_login_required
+def bulk_update_registrations():
+    # Approve/reject the checked registrations, or every pending one of an event
+    status = BULK_ACTIONS.get(request.form.get("action"))
+    reg_ids = request.form.getlist("reg_id", type=int)
+    event_id = request.form.get("event_id", type=int)
+    if not status or (not reg_ids and event_id is None):
+        flash("Select registrations and an action.", "error")
+        return redirect(url_for("admin.admin_view_registrations"))
+
+    changed = set_registration_status(status, reg_ids=reg_ids, event_id=event_id)
+    if changed and status == "Rejected":
+        invalidate_events()  # Seats were given back, so the shown counts changed
+    flash(f"{changed} registration(s) {status.lower()}.", "success")
+    return redirect(url_for("admin.admin_view_registrations"))
+
+# #######################################
+# ADMIN CRUD (EVENTS)
+# ############################################
+
+@bp.route("/create", methods=["GET", "POST"])
+@admin_login_required
+def create():
+    categories = Category.query.all()
+    if request.method == "POST":
+        title = (request.form.get("title") or "").strip()
+        category_id = request.form.get("category_id")
+        description = (request.form.get("description") or "").strip() or None
+        venue = (request.form.get("venue") or "").strip()
+        date_str = request.form.get("date")
+
+        # File Upload
+        image_file = save_upload(request.files.get('image_file')) or 'default.jpg'
+
+        if not title or not venue or not date_str or not category_id:
+            flash("Title, Category, Venue and Date are required.", "error")
+            return render_template("create.html", title=title, description=description, venue=venue, date=date_str, capacity=request.form.get("capacity"), categories=categories)
+
+        try:
+            event_date = datetime.strptime(date_str, '%Y-%m-%dT%H:%M')
+        except ValueError:
+            flash("Invalid date format.", "error")
+            return render_template("create.html", title=title, description=description, venue=venue, date=date_str, capacity=request.form.get("capacity"), categories=categories)
+
+        # Admin created events are automatically approved
+        capacity = parse_capacity(request.form.get("capacity"))
+        event = Event(title=title, category_id=category_id, description=description, venue=venue, date=event_date, status='Approved', image_file=image_file, capacity=capacity)
+        db.session.add(event)
+        index_event(event)
+        db.session.commit()
+        invalidate_events()
+
+        flash("Event created successfully!", "success")
+        return redirect(url_for("public.index"))
+
+    return render_template("create.html", title="", description="", venue="", date="", categories=categories)
+
+@bp.route("/edit/<int:event_id>", methods=["GET", "POST"])
+@admin_login_required
+def edit(event_id):
+    event = Event.query.get_or_404(event_id)
+
+    if request.method == "POST":
+        title = (request.form.get("title") or "").strip()
+        description = (request.form.get("description") or "").strip() or None
+        location = (request.form.get("location") or "").strip()
+        date_str = request.form.get("date")
+
+        if not title or not location or not date_str:
+            flash("Title, Location and Date are required.", "error")
+            return render_template("edit.html", event=event)
+
+        try:
+            event_date = datetime.strptime(date_str, '%Y-%m-%dT%H:%M')
+        except ValueError:
+            flash("Invalid date format.", "error")
+            return render_template("edit.html", event=event)
+
+        # Completed events have rendered certificates that print the title and date
+        stale_certificates = event.status == 'Completed' and (event.title, event.date) != (title, event_date)
+        event.title = title
+        event.description = description
+        event.location = location
+        event.date = event_date
+        event.capacity = parse_capacity(request.form.get("capacity"))
+
+        index_event(event)
+        db.session.commit()
+        invalidate_events()
+        if stale_certificates:
+            certificates.generate_event(event.id, overwrite=True)
+
+        flash("Event updated.", "success")
+        return redirect(url_for("public.detail", event_id=event.id))
+
+    return render_template("edit.html", event=event)
+
+@bp.route("/delete/<int:event_id>", methods=["POST"])
+@admin_login_required
+def delete(event_id):
+    event = Event.query.get_or_404(event_id)
+    remove_event(event.id)
+    db.session.delete(event)
+    db.session.commit()
+    invalidate_events()
+    flash("Event deleted.", "info")
+    return redirect(url_for("public.index"))
+
+# ##########################################
+# Admin: Manage Coordinators
+# ################################################
+
+@bp.route("/admin/coordinators")
+@admin_login_required
+def admin_coordinators():
+    coordinators = iter_batched(Coordinator.query, Coordinator.id)
+    return stream_page("admin_coordinators.html", coordinators=coordinators)
+
+@bp.route("/admin/coordinators/create", methods=["GET", "POST"])
+@admin_login_required
+def admin_create_coordinator():
+    if request.method == "POST":
+        username = request.form.get("username").strip()
+        password = request.form.get("password").strip()
+        department = request.form.get("department").strip()
+
+        if not username or not password:
+            flash("Username and password required.", "error")
+            return render_template("admin_create_coordinator.html")
+
+        if Coordinator.query.filter_by(username=username).first():
+            flash("Username already taken.", "error")
+            return render_template("admin_create_coordinator.html")
+
+        coordinator = Coordinator(username=username, department=department)
+        coordinator.set_password(password)
+        db.session.add(coordinator)
+        db.session.commit()
+
+        flash("Coordinator created successfully.", "success")
+        return redirect(url_for("admin.admin_coordinators"))
+
+    return render_template("admin_create_coordinator.html")
+
+@bp.route("/admin/coordinators/delete/<int:id>", methods=["POST"])
+@admin_login_required
+def admin_delete_coordinator(id):
+    coordinator = Coordinator.query.get_or_404(id)
+    db.session.delete(coordinator)
+    db.session.commit()
+    forget_identity('coordinator', id)
+    flash("Coordinator deleted.", "success")
+    return redirect(url_for("admin.admin_coordinators"))
+
+@bp.route("/admin/event/<int:event_id>/approve", methods=["POST"])
+@admin_login_required
+def admin_approve_event(event_id):
+    event = Event.query.get_or_404(event_id)
+    set_event_status('Approved', [event.id])
+    invalidate_events()
+    flash("Event approved.", "success")
+    return redirect(url_for("public.index"))
+
+@bp.route("/admin/event/<int:event_id>/reject", methods=["POST"])
+@admin_login_required
+def admin_reject_event(event_id):
+    event = Event.query.get_or_404(event_id)
+    set_event_status('Rejected', [event.id])
+    invalidate_events()
+    flash("Event rejected.", "success")
+    return redirect(url_for("public.index"))
+
+@bp.route("/admin/events/bulk", methods=["POST"])
+@admin_login_required
+def admin_bulk_update_events():
+    status = EVENT_BULK_ACTIONS.get(request.form.get("action"))
+    event_ids = request.form.getlist("event_id", type=int)
+    if not status or not event_ids:
+        flash("Select events and an action.", "error")
+        return redirect(url_for("public.index"))
+
+    changed = set_event_status(status, event_ids)
+    invalidate_events()
+    flash(f"{changed} event(s) {status.lower()}.", "success")
+    return redirect(url_for("public.index"))
+
+@bp.route("/admin/students")
+@admin_login_required
+@use_replica
+def admin_students():
+    students = iter_batched(Student.query, Student.id)
+    return stream_page("admin_students.html", students=students)
+
+@bp.route("/admin/students/delete/<int:id>", methods=["POST"])
+@admin_login_required
+def admin_delete_student(id):
+    student = Student.query.get_or_404(id)
+    release_student_seats(student.id)
+    db.session.delete(student)
+    db.session.commit()
+    forget_identity('student', id)
+    invalidate_events()
+    flash("Student account deleted.", "success")
+    return redirect(url_for("admin.admin_students"))
+
+@bp.route("/admin/cache/stats")
+@admin_login_required
+def admin_cache_stats():
+    return jsonify(cache.stats())
+
+@bp.route("/admin/db/pool")
+@admin_login_required
+def admin_pool_stats():
+    return jsonify(pool_stats())
+
+@bp.route("/admin/reports")
+@admin_login_required
+@use_replica
+def admin_reports():
+    filters = parse_report_filters(request.args)
+    page = request.args.get("page", 1, type=int)
+    per_page = 50
+
+    event_stats = event_registration_stats(page=page, per_page=per_page, **filters)
+    category_stats = category_registration_stats(**filters)
+
+    return render_template("admin_reports.html",
+                         event_stats=event_stats,
+                         category_stats=category_stats,
+                         filters=filters,
+                         event_statuses=EVENT_STATUSES,
+                         **report_totals())
@@ -0,0 +1,222 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+from functools import wraps
+from flask import Blueprint, Response, abort, jsonify, request, session
+from models import Event, Category, Registration, Notification
+from pagination import keyset_paginate
+from queries import with_event
+from replicas import use_replica
+from events import visibility_filter
+from identity import current_identity
+
+API_VERSION = "v1"
+bp = Blueprint("api", __name__, url_prefix=f"/api/{API_VERSION}")
+
+DEFAULT_PER_PAGE = 20
+MAX_PER_PAGE = 100
+
+# Selectable fields per resource; ?fields=a,b picks a subset
+EVENT_FIELDS = ('id', 'title', 'description', 'date', 'venue', 'category_id', 'status', 'capacity',
+                'registered_count', 'image_file', 'announcements', 'results', 'updated_at')
+CATEGORY_FIELDS = ('id', 'name')
+REGISTRATION_FIELDS = ('id', 'event_id', 'event_title', 'event_date', 'status', 'created_at', 'approved_at',
+                       'updated_at')
+NOTIFICATION_FIELDS = ('id', 'message', 'is_read', 'created_at')
+
+
+# ================
+# Helpers
+# ================
+
+def api_error(e):
+    return jsonify({"error": e.name, "message": e.description}), e.code
+
+
+# Registered per code: the app's HTML 404 handler would otherwise win
+for code in (400, 401, 404, 405):
+    bp.register_error_handler(code, api_error)
+
+
+def student_required(f):
+    # JSON 401 instead of the HTML login redirect
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        if not current_identity("student"):
+            abort(401, description="Log in as a student first.")
+        return f(*args, **kwargs)
+    return wrapper
+
+
+def _fields(allowed):
+    requested = request.args.get("fields")
+    if not requested:
+        return allowed
+    fields = tuple(dict.fromkeys(f.strip() for f in requested.split(",") if f.strip()))
+    unknown = set(fields) - set(allowed)
+    if unknown:
+        abort(400, description=f"Unknown field(s): {', '.join(sorted(unknown))}.")
+    return fields
+
+
+def _per_page():
+    return max(1, min(request.args.get("per_page", DEFAULT_PER_PAGE, type=int), MAX_PER_PAGE))
+
+
+def _visible_events():
+    """Event query limited to what the caller may see, and whether the answer is per-viewer.
+
+    Anonymous callers get the public statuses only; admins and coordinators
+    see more, so their responses must not land in a shared cache.
+    """
+    identity = current_identity()
+    query = Event.query
+    visible = visibility_filter(identity)
+    if visible is not None:
+        query = query.filter(visible)
+    return query, identity is not None
+
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _pick(values, fields):
+    return {field: _json_value(values[field]) for field in fields}
+
+
+def _etag(versions):
+    # Strong validator: same URL (fields, filters, cursor) and same row versions
+    raw = json.dumps([API_VERSION, request.full_path, versions], default=str, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def conditional_json(versions, last_modified, build, private=False):
+    """JSON from build(), or a bodyless 304 when the client's copy is still current.
+
+    `versions` identifies the rows the response is made from (ids and
+    updated_at), so the validator is checked before anything is serialized.
+    Pass `last_modified` for single resources only: a list's newest
+    updated_at says nothing about rows that were added elsewhere or deleted.
+    """
+    etag = _etag(versions)
+    if request.if_none_match:
+        # Weak comparison: compression.py weakens the tag on encoded responses
+        fresh = request.if_none_match.contains_weak(etag)
+    else:
+        since = request.if_modified_since
+        fresh = bool(since and last_modified
+                     and last_modified.replace(microsecond=0, tzinfo=timezone.utc) <= since)
+
+    response = Response(status=304) if fresh else jsonify(build())
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # Clients may keep a copy but must revalidate it on every use
+    response.headers["Cache-Control"] = "private, no-cache" if private else "no-cache"
+    return response
+
+
+def _page_body(page, serialize, fields):
+    return {
+        "data": [serialize(item, fields) for item in page.items],
+        "next_cursor": page.next_cursor,
+        "prev_cursor": page.prev_cursor,
+    }
+
+
+def _page_versions(page, versions):
+    # The cursors are part of the body: a row added past a full last page
+    # changes next_cursor without touching any row on this one
+    return {"rows": versions, "next": page.next_cursor, "prev": page.prev_cursor}
+
+
+# ================
+# Events & categories
+# ================
+
+def _event(event, fields):
+    return _pick({field: getattr(event, field) for field in fields}, fields)
+
+
+@bp.route("/events")
+@use_replica
+def events():
+    fields = _fields(EVENT_FIELDS)
+    query, private = _visible_events()
+    if request.args.get("status"):
+        query = query.filter(Event.status == request.args["status"])
+    if request.args.get("category_id", type=int):
+        query = query.filter(Event.category_id == request.args.get("category_id", type=int))
+    page = keyset_paginate(query, [Event.date, Event.id], cursor=request.args.get("cursor"), per_page=_per_page())
+
+    return conditional_json(_page_versions(page, [(e.id, e.updated_at) for e in page.items]), None,
+                            lambda: _page_body(page, _event, fields), private=private)
+
+
+@bp.route("/events/<int:event_id>")
+@use_replica
+def event(event_id):
+    fields = _fields(EVENT_FIELDS)
+    query, private = _visible_events()
+    # Hidden events are a 404, like missing ones, so ids can't be probed
+    item = query.filter(Event.id == event_id).first_or_404()
+    return conditional_json([item.id, item.updated_at], item.updated_at, lambda: {"data": _event(item, fields)},
+                            private=private)
+
+
+@bp.route("/categories")
+@use_replica
+def categories():
+    fields = _fields(CATEGORY_FIELDS)
+    rows = Category.query.order_by(Category.id).all()
+    return conditional_json([(c.id, c.name) for c in rows], None,
+                            lambda: {"data": [_pick({"id": c.id, "name": c.name}, fields) for c in rows]})
+
+
+# ================
+# The logged-in student
+# ================
+
+def _registration(reg, fields):
+    values = {
+        "id": reg.id, "event_id": reg.event_id, "event_title": reg.event.title, "event_date": reg.event.date,
+        "status": reg.status, "created_at": reg.created_at, "approved_at": reg.approved_at,
+        "updated_at": reg.updated_at,
+    }
+    return _pick(values, fields)
+
+
+@bp.route("/me/registrations")
+@student_required
+@use_replica
+def my_registrations():
+    fields = _fields(REGISTRATION_FIELDS)
+    query = Registration.query.options(with_event()).filter(Registration.student_id == session["student_id"])
+    page = keyset_paginate(query, [Registration.created_at, Registration.id], cursor=request.args.get("cursor"),
+                           per_page=_per_page(), descending=True)
+
+    # The payload includes event title/date, so event edits change the validator too
+    versions = [(r.id, r.updated_at, r.event.updated_at) for r in page.items]
+    return conditional_json(_page_versions(page, versions), None,
+                            lambda: _page_body(page, _registration, fields), private=True)
+
+
+def _notification(n, fields):
+    return _pick({"id": n.id, "message": n.message, "is_read": n.is_read, "created_at": n.created_at}, fields)
+
+
+@bp.route("/me/notifications")
+@student_required
+@use_replica
+def my_notifications():
+    fields = _fields(NOTIFICATION_FIELDS)
+    query = Notification.query.filter(Notification.student_id == session["student_id"])
+    if request.args.get("unread") == "1":
+        query = query.filter(Notification.is_read.is_(False))
+    page = keyset_paginate(query, [Notification.created_at, Notification.id], cursor=request.args.get("cursor"),
+                           per_page=_per_page(), descending=True)
+
+    # Notifications are only ever marked read, so is_read is their version
+    versions = [(n.id, n.is_read) for n in page.items]
+    return conditional_json(_page_versions(page, versions), None, lambda: _page_body(page, _notification, fields), private=True)
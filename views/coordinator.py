@@ -0,0 +1,179 @@
+from datetime import datetime
+from flask import Blueprint, render_template, redirect, url_for, flash, request, session
+from models import db, Event, Coordinator, Category
+from queries import registrations_for_event
+from exports import csv_response, participant_rows, PARTICIPANT_HEADER
+from notifications import dispatcher, event_update_message
+from events import invalidate_events
+from certificates import certificates
+from search import index_event
+from auth import authenticate, LoginThrottled, AuthBusy
+from identity import current_identity
+from views import coordinator_login_required, save_upload, parse_capacity
+
+bp = Blueprint("coordinator", __name__)
+
+# ###############################################################
+# COORDINATOR AUTHENTICATION & DASHBOARD
+# ######################################################################
+
+@bp.route("/coordinator/login", methods=["GET", "POST"])
+def coordinator_login():
+    if request.method == "POST":
+        username = request.form.get("username").strip()
+        password = request.form.get("password").strip()
+
+        try:
+            coordinator = authenticate(Coordinator, username, password)
+        except LoginThrottled:
+            flash("Too many login attempts. Please wait a few minutes and try again.", "error")
+            return render_template("coordinator_login.html"), 429
+        except AuthBusy:
+            flash("The server is busy. Please try again in a moment.", "error")
+            return render_template("coordinator_login.html"), 503
+
+        if not coordinator:
+            flash("Invalid username or password.", "error")
+            return render_template("coordinator_login.html")
+
+        session.clear()
+        session["coordinator_id"] = coordinator.id
+
+        flash("Logged in successfully.", "success")
+        return redirect(url_for("coordinator.coordinator_dashboard"))
+
+    return render_template("coordinator_login.html")
+
+@bp.route("/coordinator/logout")
+def coordinator_logout():
+    session.pop("coordinator_id", None)
+    flash("Logged out.", "info")
+    return redirect(url_for("public.index"))
+
+@bp.route("/coordinator/dashboard")
+@coordinator_login_required
+def coordinator_dashboard():
+    coordinator = current_identity()
+    events = Event.query.filter_by(coordinator_id=coordinator["id"]).all()
+    return render_template("coordinator_dashboard.html", coordinator=coordinator, events=events)
+
+@bp.route("/coordinator/create_event", methods=["GET", "POST"])
+@coordinator_login_required
+def coordinator_create_event():
+    categories = Category.query.all()
+    if request.method == "POST":
+        title = (request.form.get("title") or "").strip()
+        category_id = request.form.get("category_id")
+        description = (request.form.get("description") or "").strip() or None
+        venue = (request.form.get("venue") or "").strip()
+        date_str = request.form.get("date")
+
+        # File Upload
+        image_file = save_upload(request.files.get('image_file')) or 'default.jpg'
+
+        if not title or not venue or not date_str or not category_id:
+            flash("Title, Category, Venue and Date are required.", "error")
+            return render_template("create.html", title=title, description=description, venue=venue, date=date_str, capacity=request.form.get("capacity"), categories=categories, is_coordinator=True)
+
+        try:
+            event_date = datetime.strptime(date_str, '%Y-%m-%dT%H:%M')
+        except ValueError:
+            flash("Invalid date format.", "error")
+            return render_template("create.html", title=title, description=description, venue=venue, date=date_str, capacity=request.form.get("capacity"), categories=categories, is_coordinator=True)
+
+        coordinator_id = session["coordinator_id"]
+        capacity = parse_capacity(request.form.get("capacity"))
+        event = Event(title=title, category_id=category_id, description=description, venue=venue, date=event_date, coordinator_id=coordinator_id, status='Proposed', image_file=image_file, capacity=capacity)
+        db.session.add(event)
+        index_event(event)
+        db.session.commit()
+        invalidate_events()
+
+        flash("Event proposed successfully. Waiting for admin approval.", "success")
+        return redirect(url_for("coordinator.coordinator_dashboard"))
+
+    return render_template("create.html", title="", description="", venue="", date="", categories=categories, is_coordinator=True)
+
+@bp.route("/coordinator/edit_event/<int:event_id>", methods=["GET", "POST"])
+@coordinator_login_required
+def coordinator_edit_event(event_id):
+    event = Event.query.get_or_404(event_id)
+    categories = Category.query.all()
+
+    if event.coordinator_id != session["coordinator_id"]:
+        flash("Unauthorized access.", "error")
+        return redirect(url_for("coordinator.coordinator_dashboard"))
+
+    if request.method == "POST":
+        title = (request.form.get("title") or "").strip()
+        category_id = request.form.get("category_id")
+        description = (request.form.get("description") or "").strip() or None
+        venue = (request.form.get("venue") or "").strip()
+        date_str = request.form.get("date")
+        announcements = (request.form.get("announcements") or "").strip() or None
+        results = (request.form.get("results") or "").strip() or None
+
+        image_file = save_upload(request.files.get('image_file'))
+        if image_file:
+            event.image_file = image_file
+
+        if not title or not venue or not date_str or not category_id:
+            flash("Title, Category, Venue and Date are required.", "error")
+            return render_template("edit.html", event=event, categories=categories, is_coordinator=True)
+
+        try:
+            event_date = datetime.strptime(date_str, '%Y-%m-%dT%H:%M')
+        except ValueError:
+            flash("Invalid date format.", "error")
+            return render_template("edit.html", event=event, categories=categories, is_coordinator=True)
+
+        # Completed events have rendered certificates that print these three
+        stale_certificates = (event.status == 'Completed'
+                              and (event.title, event.venue, event.date) != (title, venue, event_date))
+        event.title = title
+        event.category_id = category_id
+        event.description = description
+        event.venue = venue
+        event.date = event_date
+        changed = {field: text for field, text in (("announcements", announcements), ("results", results))
+                   if text and text != getattr(event, field)}
+        event.announcements = announcements
+        event.results = results
+        event.capacity = parse_capacity(request.form.get("capacity"))
+
+        index_event(event)
+        db.session.commit()
+        invalidate_events()
+        if stale_certificates:
+            certificates.generate_event(event.id, overwrite=True)
+
+        # Tell registrants about new announcements/results in the background
+        for field, text in changed.items():
+            dispatcher.dispatch(event.id, event_update_message(event, field, text), event.updated_at)
+
+        flash("Event updated.", "success")
+        return redirect(url_for("coordinator.coordinator_dashboard"))
+
+    return render_template("edit.html", event=event, categories=categories, is_coordinator=True)
+
+@bp.route("/coordinator/event/<int:event_id>/export")
+@coordinator_login_required
+def coordinator_export_participants(event_id):
+    event = Event.query.get_or_404(event_id)
+    if event.coordinator_id != session["coordinator_id"]:
+        flash("Unauthorized access.", "error")
+        return redirect(url_for("coordinator.coordinator_dashboard"))
+
+    gzip = request.args.get("gzip") == "1"
+    return csv_response(f"participants_{event.id}.csv", PARTICIPANT_HEADER, participant_rows(event.id), gzip=gzip)
+
+@bp.route("/coordinator/event/<int:event_id>/participants")
+@coordinator_login_required
+def coordinator_event_participants(event_id):
+    event = Event.query.get_or_404(event_id)
+    if event.coordinator_id != session["coordinator_id"]:
+        flash("Unauthorized access.", "error")
+        return redirect(url_for("coordinator.coordinator_dashboard"))
+
+    registrations = registrations_for_event(event.id).all()
+    return render_template("coordinator_participants.html", event=event, registrations=registrations)
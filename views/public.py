@@ -0,0 +1,58 @@
+from datetime import timedelta
+from flask import Blueprint, render_template, request, session
+from models import Registration
+from events import event_page, archive_page, event_detail_or_404
+from search import search_events
+from reports import parse_report_filters
+from replicas import use_replica
+from identity import current_identity
+
+bp = Blueprint("public", __name__)
+
+# Completed events live on the archive page instead
+INDEX_STATUSES = ("Approved", "Proposed", "Rejected")
+
+# ##########################################
+# PUBLIC EVENT VIEWS
+# ################################################
+
+@bp.route("/")
+@use_replica
+def index():
+    # Upcoming approved events; admins can also review proposed and rejected ones, past-dated included
+    status = request.args.get("status", "Approved")
+    if status not in INDEX_STATUSES or (status != "Approved" and not current_identity("admin")):
+        status = "Approved"
+    events = event_page(request.args.get("cursor"), per_page=6, status=status)
+    return render_template("list.html", events=events, status=status, statuses=INDEX_STATUSES)
+
+@bp.route("/archive")
+@use_replica
+def archive():
+    events = archive_page(request.args.get("cursor"), per_page=12)
+    return render_template("archive.html", events=events)
+
+@bp.route("/search")
+@use_replica
+def search():
+    q = (request.args.get("q") or "").strip()
+    category_id = request.args.get("category_id", type=int)
+    filters = parse_report_filters(request.args)
+    end = filters["end"] + timedelta(days=1) if filters["end"] else None
+    page = request.args.get("page", 1, type=int)
+
+    results = search_events(q, category_id=category_id, start=filters["start"], end=end, page=page,
+                            viewer=current_identity())
+    return render_template("search.html", q=q, results=results, category_id=category_id)
+
+@bp.route("/event/<int:event_id>")
+@use_replica
+def detail(event_id):
+    event = event_detail_or_404(event_id)
+    is_registered = False
+    if session.get("student_id"):
+        student_id = session.get("student_id")
+        if Registration.query.filter_by(student_id=student_id, event_id=event_id).first():
+            is_registered = True
+
+    return render_template("detail.html", event=event, is_registered=is_registered)
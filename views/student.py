@@ -0,0 +1,182 @@
+from flask import Blueprint, render_template, redirect, url_for, flash, request, session, send_file, current_app
+from models import db, Event, Student, Notification
+from queries import registrations_for_student
+from pagination import keyset_paginate
+from registrations import register_student, REGISTERED, DUPLICATE
+from notifications import mark_all_read
+from events import invalidate_event_detail
+from certificates import certificates, certificate_rows
+from auth import authenticate, LoginThrottled, AuthBusy
+from replicas import use_replica
+from identity import current_identity, current_user
+from views import student_login_required
+
+bp = Blueprint("student", __name__)
+
+# ###############################################################
+# STUDENT AUTHINCATION
+# ######################################################################
+
+@bp.route("/student/register", methods=["GET", "POST"])
+def student_register():
+    if request.method == "POST":
+        username = request.form.get("username").strip()
+        email = request.form.get("email").strip()
+        password = request.form.get("password").strip()
+
+        if not username or not email or not password:
+            flash("All fields are required.", "error")
+            return render_template("student_register.html")
+
+        if Student.query.filter_by(username=username).first() or Student.query.filter_by(email=email).first():
+            flash("Username or email already taken.", "error")
+            return render_template("student_register.html")
+
+        student = Student(username=username, email=email)
+        student.set_password(password)
+        db.session.add(student)
+        db.session.commit()
+
+        flash("Registered successfully. Please login.", "success")
+        return redirect(url_for("student.student_login"))
+
+    return render_template("student_register.html")
+
+@bp.route("/student/login", methods=["GET", "POST"])
+def student_login():
+    if request.method == "POST":
+        username = request.form.get("username").strip()
+        password = request.form.get("password").strip()
+
+        try:
+            student = authenticate(Student, username, password)
+        except LoginThrottled:
+            flash("Too many login attempts. Please wait a few minutes and try again.", "error")
+            return render_template("student_login.html"), 429
+        except AuthBusy:
+            flash("The server is busy. Please try again in a moment.", "error")
+            return render_template("student_login.html"), 503
+
+        if not student:
+            flash("Invalid username or password.", "error")
+            return render_template("student_login.html")
+
+        session.clear()
+        session["student_id"] = student.id
+
+        flash("Logged in successfully.", "success")
+        return redirect(url_for("student.student_dashboard"))
+
+    return render_template("student_login.html")
+
+@bp.route("/student/logout")
+def student_logout():
+    session.pop("student_id", None)
+    flash("Logged out.", "info")
+    return redirect(url_for("public.index"))
+
+# #####################################################
+# EVENT REGISTRATION
+# ########################################################
+
+@bp.route("/student/register_event/<int:event_id>", methods=["POST"])
+@student_login_required
+def register_event(event_id):
+    student_id = session["student_id"]
+    event = Event.query.get_or_404(event_id)
+
+    result = register_student(student_id, event.id)
+    if result == REGISTERED:
+        invalidate_event_detail(event.id)
+    if result == DUPLICATE:
+        flash("You are already registered for this event.", "info")
+        return redirect(url_for("public.detail", event_id=event.id))
+    if result != REGISTERED:
+        flash("Sorry, this event is full.", "error")
+        return redirect(url_for("public.detail", event_id=event.id))
+
+    flash("Registered for event successfully.", "success")
+    return redirect(url_for("student.student_dashboard"))
+
+
+# ################################################
+# STUDENT DASHBOARD
+# ####################################################
+
+@bp.route("/student/dashboard")
+@student_login_required
+def student_dashboard():
+    student = current_identity()
+    registrations = registrations_for_student(student["id"]).all()
+    return render_template("student_dashboard.html", student=student, registrations=registrations)
+
+@bp.route("/student/history")
+@student_login_required
+@use_replica
+def student_history():
+    registrations = registrations_for_student(session["student_id"]).all()
+    return render_template("student_history.html", registrations=registrations)
+
+@bp.route("/student/certificate/<int:event_id>")
+@student_login_required
+def student_certificate(event_id):
+    # Checked on every download: a cached file outlives a revoked registration
+    row = next(certificate_rows(event_id, session["student_id"]), None)
+    if not row:
+        flash("Certificate not available.", "error")
+        return redirect(url_for("student.student_dashboard"))
+
+    if row["event"]["status"] != "Completed":
+        # Details can still change before the event is over, so nothing is cached yet
+        return certificates.render(row)
+
+    # Usually written by the batch run when the event was completed
+    response = send_file(certificates.write(row), mimetype="text/html", conditional=True,
+                         as_attachment=request.args.get("download") == "1",
+                         download_name=f"certificate-{event_id}.html",
+                         max_age=current_app.config["CERTIFICATE_MAX_AGE"])
+    # Per-student content: browsers may keep it, shared caches may not
+    response.cache_control.public = False
+    response.cache_control.private = True
+    return response
+
+@bp.route("/student/notifications")
+@student_login_required
+def student_notifications():
+    student_id = session["student_id"]
+
+    # Mark as read before loading the page: the commit would expire the rows
+    # and the template would reload each one. Always run: the cached unread
+    # count misses rows other processes added, and the UPDATE is an index probe
+    mark_all_read(student_id)
+
+    notifications = keyset_paginate(Notification.query.filter_by(student_id=student_id),
+                                    [Notification.created_at, Notification.id],
+                                    cursor=request.args.get("cursor"), per_page=20, descending=True)
+    return render_template("student_notifications.html", notifications=notifications)
+
+@bp.route("/student/profile", methods=["GET", "POST"])
+@student_login_required
+def student_profile():
+    student = current_user()
+
+    if request.method == "POST":
+        email = request.form.get("email").strip()
+        password = request.form.get("password").strip()
+
+        if email:
+            # Check if email is taken by another student
+            existing = Student.query.filter_by(email=email).first()
+            if existing and existing.id != student.id:
+                flash("Email already taken.", "error")
+            else:
+                student.email = email
+
+        if password:
+            student.set_password(password)
+
+        db.session.commit()
+        flash("Profile updated successfully.", "success")
+        return redirect(url_for("student.student_profile"))
+
+    return render_template("student_profile.html", student=student)